@@ -3,17 +3,24 @@
 # Run this *in* the RAFT directory, or bad things will happen (or nothing at all).
 
 import argparse
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fnmatch import fnmatch
+import functools
 from glob import glob
 import hashlib
+import io
+import mmap
 import json
 import os
-import random
 import re
+import shlex
 import shutil
-import string
 import subprocess
 import sys
 import tarfile
+import tempfile
 import time
 
 from os.path import join as pjoin
@@ -21,11 +28,137 @@ from os import getcwd
 
 from git import Repo
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Precompiled patterns for snapshot post-processing.
+RUN_WF_RE = re.compile('run-workflow')
+PROFILE_RE = re.compile('-profile')
+
+# Precompiled patterns for Nextflow module parsing.
+INCLUDE_RE = re.compile(r'^include.*nf.*')
+NF_SUFFIX_RE = re.compile(r'\.nf$')
+STEP_CALL_RE = re.compile(r'^[\w_]+\(.*')
+PARAMS_RE = re.compile(r'params.*,|params.*\)')
+PARAMS_TOKEN_RE = re.compile(r'(params.*?,|params.*?\)|params.*\?})')
+PARAMS_ANY_RE = re.compile(r'params.')
+# Characters stripped from parameter tokens.
+PARAM_STRIP_TABLE = str.maketrans('', '', ",)}'\"\\")
+
+# Administrative commands which are not recorded in auto.raft.
+ADMIN_CMDS = frozenset(['init-project', 'run-auto', 'package-project',
+                        'load-project', 'setup', 'push-project',
+                        'rename-project', 'run-workflow', 'copy-parameters'])
+
+
+def json_dumps(obj, indent=False):
+    """
+    Serializes an object to JSON bytes. Uses orjson when available and falls
+    back to the standard library json module otherwise.
+
+    Args:
+        obj (dict): Object to serialize.
+        indent (bool): Pretty-print output (orjson only supports two space
+                       indentation, json uses four).
+
+    Returns:
+        Bytes containing the JSON representation of obj.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=4 if indent else None).encode('utf8')
+
+
+def json_loads(contents):
+    """
+    Deserializes JSON bytes/str. Uses orjson when available and falls back to
+    the standard library json module otherwise.
+
+    Args:
+        contents (bytes): JSON document.
+
+    Returns:
+        Object represented by contents.
+    """
+    if orjson is not None:
+        return orjson.loads(contents)
+    return json.loads(contents)
+
+
+def fast_parse_run_workflow(argv):
+    """
+    Part of run-workflow mode.
+
+    Parses run-workflow arguments without building the full argparse tree.
+    run-workflow is executed repeatedly within a project, so skipping argparse
+    setup trims RAFT's startup time. Any token that isn't understood here
+    results in None so get_args() can fall back to argparse (which also
+    handles -h/--help and error reporting).
+
+    Args:
+        argv (list): Arguments following 'run-workflow'.
+
+    Returns:
+        Namespace object with run-workflow arguments or None.
+    """
+    flags = {'--no-resume': 'no_resume',
+             '-k': 'keep_previous_outputs',
+             '--keep-previous-outputs': 'keep_previous_outputs',
+             '-r': 'no_reports',
+             '--no-reports': 'no_reports'}
+    opts = {'-w': 'workflow',
+            '--workflow': 'workflow',
+            '-n': 'nf_params',
+            '--nf-params': 'nf_params',
+            '-p': 'project_id',
+            '--project-id': 'project_id'}
+    parsed = {'command': 'run-workflow',
+              'no_resume': False,
+              'workflow': 'main',
+              'nf_params': None,
+              'project_id': None,
+              'keep_previous_outputs': False,
+              'no_reports': False}
+
+    idx = 0
+    while idx < len(argv):
+        token = argv[idx]
+        value = None
+        if '=' in token:
+            token, _, value = token.partition('=')
+        if token in flags and value is None:
+            parsed[flags[token]] = True
+        elif token in opts:
+            if value is None:
+                idx += 1
+                # Leave option-like values (e.g. '-profile test') to argparse.
+                if idx >= len(argv) or argv[idx].startswith('-'):
+                    return None
+                value = argv[idx]
+            parsed[opts[token]] = value
+        else:
+            return None
+        idx += 1
+
+    if not parsed['project_id']:
+        return None
+
+    return argparse.Namespace(**parsed)
+
 
 def get_args():
     """
     Collecting user-defined arguments.
     """
+    if (len(sys.argv) > 1 and sys.argv[1] == 'run-workflow' and
+            not os.environ.get('RAFT_DEBUG_ARGPARSE')):
+        args = fast_parse_run_workflow(sys.argv[2:])
+        if args is not None:
+            return args
+
     parser = argparse.ArgumentParser(prog="RAFT",
                                      description="""Reproducible
                                                     Analyses
@@ -163,7 +296,8 @@ def get_args():
                                      help="Workflow to run (default: main).",
                                      default='main')
     parser_run_workflow.add_argument('-n', '--nf-params',
-                                     help="Parameter string passed to Nextflow (see documentation).")
+                                     help="Parameter string passed to Nextflow (see documentation). "
+                                          "Split like a shell command line; $VARs and ~ are expanded, globs are not.")
     parser_run_workflow.add_argument('-p', '--project-id',
                                      help="Project identifier",
                                      required=True)
@@ -288,13 +422,16 @@ def setup(args):
     if args.default:
         print("Using defaults due to -d/--default flag...")
 
+    # RAFT is anchored to the current working directory.
+    raft_dir = getcwd()
+
     # DEFAULTS
-    raft_paths = {'projects': pjoin(getcwd(), 'projects'),
-                  'references': pjoin(getcwd(), 'references'),
-                  'fastqs': pjoin(getcwd(), 'fastqs'),
-                  'imgs': pjoin(getcwd(), 'imgs'),
-                  'metadata': pjoin(getcwd(), 'metadata'),
-                  'shared': pjoin(getcwd(), 'shared')}
+    raft_paths = {'projects': pjoin(raft_dir, 'projects'),
+                  'references': pjoin(raft_dir, 'references'),
+                  'fastqs': pjoin(raft_dir, 'fastqs'),
+                  'imgs': pjoin(raft_dir, 'imgs'),
+                  'metadata': pjoin(raft_dir, 'metadata'),
+                  'shared': pjoin(raft_dir, 'shared')}
 
     init_cfg = {"references": "",
                 "fastqs": "",
@@ -307,10 +444,10 @@ def setup(args):
                 "rftpkgs": "",
                 ".raft": ""}
 
-    with open(pjoin(getcwd(), '.init.cfg'), 'w', encoding='utf8') as init_cfg_fo:
-        json.dump(init_cfg, init_cfg_fo)
+    with open(pjoin(raft_dir, '.init.cfg'), 'wb') as init_cfg_fo:
+        init_cfg_fo.write(json_dumps(init_cfg))
 
-    with open(pjoin(getcwd(), '.init.wf'), 'w', encoding='utf8') as init_wf_fo:
+    with open(pjoin(raft_dir, '.init.wf'), 'w', encoding='utf8') as init_wf_fo:
         init_wf_fo.write('#!/usr/bin/env nextflow\n')
         init_wf_fo.write('nextflow.enable.dsl=2\n')
         init_wf_fo.write('\n')
@@ -338,7 +475,7 @@ def setup(args):
         init_wf_fo.write('workflow {\n')
         init_wf_fo.write('}\n')
 
-    with open(pjoin(getcwd(), '.nextflow.config'), 'w', encoding='utf8') as nf_cfg_fo:
+    with open(pjoin(raft_dir, '.nextflow.config'), 'w', encoding='utf8') as nf_cfg_fo:
         nf_cfg_fo.write("manifest.mainScript = 'main.nf'\n")
         nf_cfg_fo.write("\n")
         nf_cfg_fo.write("process {\n")
@@ -355,14 +492,16 @@ def setup(args):
 
     # Ideally, users should be able to specify where .raft.cfg lives but RAFT
     # needs an "anchor" for defining other directories.
-    cfg_path = pjoin(getcwd(), '.raft.cfg')
+    cfg_path = pjoin(raft_dir, '.raft.cfg')
 
     # Make backup of previous configuration file.
-    if os.path.isfile(cfg_path):
-        bkup_cfg_path = cfg_path + '.orig'
+    bkup_cfg_path = cfg_path + '.orig'
+    try:
+        os.rename(cfg_path, bkup_cfg_path)
         print("A configuration file already exists.")
         print(f"Copying original to {bkup_cfg_path}.")
-        os.rename(cfg_path, bkup_cfg_path)
+    except FileNotFoundError:
+        pass
 
     if not args.default:
         # Setting up filesystem paths.
@@ -408,8 +547,11 @@ def get_user_raft_paths(raft_paths):
         user_spec_path = input(f"Provide a global (among projects) directory for {raft_path} (Default: {default}): ")
         # Should be doing some sanity checking here to ensure the path can exist.
         if user_spec_path:
-            if re.search('~', user_spec_path):
-                user_spec_path = os.path.realpath(os.path.expanduser(user_spec_path))
+            if '~' in user_spec_path:
+                user_spec_path = os.path.expanduser(user_spec_path)
+                # Only resolve symlinks (N readlinks) when the path needs it.
+                if os.path.islink(user_spec_path) or not os.path.isabs(user_spec_path):
+                    user_spec_path = os.path.realpath(user_spec_path)
             raft_paths[raft_path] = user_spec_path
     return raft_paths
 
@@ -451,8 +593,10 @@ def dump_cfg(cfg_path, master_cfg):
         cfg_path (str): Path for writing output file.
         master_cfg (dict): Dictionary containing configuration information.
     """
-    with open(cfg_path, 'w', encoding='utf8') as cfg_fo:
-        json.dump(master_cfg, cfg_fo, indent=4)
+    with open(cfg_path, 'wb') as cfg_fo:
+        cfg_fo.write(json_dumps(master_cfg, indent=True))
+    # Coarse filesystem timestamps may not distinguish the rewrite.
+    read_raft_cfg.cache_clear()
 
 
 def setup_run_once(master_cfg):
@@ -465,11 +609,12 @@ def setup_run_once(master_cfg):
     Args:
         master_cfg (dict): Dictionary with configuration information.
     """
+    raft_dir = getcwd()
     for directory in master_cfg['filesystem'].values():
         if os.path.isdir(directory): # Need to ensure directory isn't already in RAFT directory.
-            print(f"Symlinking {directory} to {getcwd()}...")
+            print(f"Symlinking {directory} to {raft_dir}...")
             try:
-                os.symlink(directory, pjoin(getcwd(), os.path.basename(directory)))
+                os.symlink(directory, pjoin(raft_dir, os.path.basename(directory)))
             except FileExistsError:
                 print(f"{directory} already exists.")
         else:
@@ -532,35 +677,42 @@ def mk_main_wf_and_cfg(args):
         args (Namespace object): User-provided arguments
     """
     raft_cfg = load_raft_cfg()
-    tmplt_wf_file = os.path.join(os.getcwd(), '.init.wf')
-    tmplt_cfg_file = os.path.join(os.getcwd(), '.nextflow.config')
+    raft_dir = getcwd()
+    tmplt_wf_file = pjoin(raft_dir, '.init.wf')
+    tmplt_cfg_file = pjoin(raft_dir, '.nextflow.config')
     proj_wf_path = pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'workflow')
+    main_nf_path = pjoin(proj_wf_path, 'main.nf')
+    nf_cfg_path = pjoin(proj_wf_path, 'nextflow.config')
+    mounts_cfg_path = pjoin(proj_wf_path, 'mounts.config')
     with open(tmplt_wf_file, encoding='utf8') as origfo:
-        with open(pjoin(proj_wf_path, 'main.nf'), 'w', encoding='utf8') as outfo:
-            for line in origfo.readlines():
+        with open(main_nf_path, 'w', encoding='utf8') as outfo:
+            for line in origfo:
                 if line == "params.project_dir = ''\n":
                     line = f"params.project_identifier = '{args.project_id}'\nparams.project_dir = ''\n"
                 outfo.write(line)
 
-    shutil.copyfile(tmplt_cfg_file, pjoin(proj_wf_path, 'nextflow.config'))
-
     # Adding Singularity info and making nextflow.config.
     imgs_dir = raft_cfg['filesystem']['imgs']
-    cfg_out = ["manifest.mainScript = 'main.nf'\n\n"]
-    cfg_out.append('singularity {\n')
-    cfg_out.append(f'  cacheDir = "{imgs_dir}"\n')
-    cfg_out.append("  autoMount = 'true'\n")
-    cfg_out.append('}\n')
-
-    with open(pjoin(proj_wf_path, 'nextflow.config'), encoding='utf8') as nf_cfg_fo:
-        cfg_out.extend(nf_cfg_fo.readlines()[1:])
-    proc_idx = cfg_out.index("process {\n")
-    mounts_cfg_path = pjoin(proj_wf_path, 'mounts.config')
-    cfg_out.insert(proc_idx + 1, f"containerOptions = '-B `cat {mounts_cfg_path}` --no-home'\n")
 
-    with open(pjoin(proj_wf_path, 'nextflow.config'), 'w', encoding='utf8') as nf_cfg_fo:
-        for row in cfg_out:
-            nf_cfg_fo.write(row)
+    def emit_cfg(tmplt_cfg_fo):
+        """
+        Yields nextflow.config lines: Singularity block, then the template
+        (minus its manifest line) with containerOptions following 'process {'.
+        """
+        yield "manifest.mainScript = 'main.nf'\n\n"
+        yield 'singularity {\n'
+        yield f'  cacheDir = "{imgs_dir}"\n'
+        yield "  autoMount = 'true'\n"
+        yield '}\n'
+        next(tmplt_cfg_fo, None)
+        for line in tmplt_cfg_fo:
+            yield line
+            if line == "process {\n":
+                yield f"containerOptions = '-B `cat {mounts_cfg_path}` --no-home'\n"
+
+    with open(tmplt_cfg_file, encoding='utf8') as tmplt_cfg_fo:
+        with open(nf_cfg_path, 'w', encoding='utf8') as nf_cfg_fo:
+            nf_cfg_fo.writelines(emit_cfg(tmplt_cfg_fo))
 
 
 def mk_auto_raft(args):
@@ -629,21 +781,22 @@ def fill_dir(args, directory, init_cfg):
     # Getting the directories to be bound by this function as well. This should
     # probably be done a different way.
     bind_dirs = []
-    raft_cfg = load_raft_cfg()
     req_sub_dirs = {}
-    with open(init_cfg, encoding='utf8') as init_cfg_fo:
-        req_sub_dirs = json.load(init_cfg_fo)
-    for name, sdir in req_sub_dirs.items():
-        # If the desired directory has an included path, link that path to
-        # within the project directory. This should include some sanity
-        # checking to ensure the sub_dir directory even exists.
-        if sdir:
-            os.symlink(sdir, pjoin(directory, name))
-        # Else if the desired directory doesn't have an included path, simply
-        # make a directory by that name within the project directory.
-        elif not sdir:
-            os.mkdir(pjoin(directory, name))
-    bind_dirs.append(pjoin(raft_cfg['filesystem']['projects'], args.project_id))
+    with open(init_cfg, 'rb') as init_cfg_fo:
+        req_sub_dirs = json_loads(init_cfg_fo.read())
+    # If the desired directory has an included path, link that path to
+    # within the project directory. This should include some sanity
+    # checking to ensure the sub_dir directory even exists.
+    to_symlink = [(name, sdir) for name, sdir in req_sub_dirs.items() if sdir]
+    # Else if the desired directory doesn't have an included path, simply
+    # make a directory by that name within the project directory.
+    to_mkdir = [name for name, sdir in req_sub_dirs.items() if not sdir]
+    for name, sdir in to_symlink:
+        os.symlink(sdir, pjoin(directory, name))
+    for name in to_mkdir:
+        os.mkdir(pjoin(directory, name))
+    # directory is the project path (<projects>/<project_id>).
+    bind_dirs.append(directory)
 #    bind_dirs.append(raft_cfg['filesystem']['work'])
     bind_dirs.append(getcwd())
 
@@ -666,11 +819,10 @@ def mk_mounts_cfg(directory, bind_dirs):
         directory (str): Project path.
         bind_dirs (list): Directories to be included in mounts.config file.
     """
-    out = []
     out = ','.join(bind_dirs)
 
-    with open(pjoin(directory, 'workflow', 'mounts.config'), 'w', encoding='utf8') as mnt_cfg_fo:
-        mnt_cfg_fo.write(f'{out}')
+    with open(pjoin(directory, 'workflow', 'mounts.config'), 'wb') as mnt_cfg_fo:
+        mnt_cfg_fo.write(out.encode('utf8'))
 
 
 def update_mounts_cfg(mounts_cfg, bind_dirs):
@@ -690,21 +842,27 @@ def update_mounts_cfg(mounts_cfg, bind_dirs):
     with open(mounts_cfg, 'r', encoding='utf8') as ifo:
         line = ifo.readline()
         line = line.strip('\n')
-        paths = line.split(',')
-        bind_dirs_to_add = []
-        for bind_dir in bind_dirs:
-            if not any([bind_dir.startswith(path) for path in paths]):
-                bind_dirs_to_add.append(bind_dir)
-            for path in paths:
-                if path.startswith(bind_dir):
-                    paths.remove(path)
-        paths.extend(bind_dirs_to_add)
-        paths = ','.join(paths) + '\n'
+        paths = [path for path in line.split(',') if path]
+        # Only the minimal set of directories needs binding. Sorting by path
+        # components places every directory directly before its
+        # subdirectories, so a single sweep can drop anything within the
+        # most recently kept directory.
+        kept = []
+        for path in sorted(set(paths) | set(bind_dirs), key=lambda x: x.rstrip(os.sep).split(os.sep)):
+            if kept and (path == kept[-1] or path.startswith(kept[-1].rstrip(os.sep) + os.sep)):
+                continue
+            kept.append(path)
+        paths = ','.join(kept) + '\n'
         out.append(paths)
 
-    with open(mounts_cfg, 'w', encoding='utf8') as mnt_cfg_fo:
-        for row in out:
-            mnt_cfg_fo.write(row)
+    # Write alongside and swap in so an interrupted run can't leave a
+    # truncated mounts.config behind.
+    with tempfile.NamedTemporaryFile('w', encoding='utf8', dir=os.path.dirname(mounts_cfg), delete=False) as mnt_cfg_fo:
+        mnt_cfg_fo.writelines(out)
+        mnt_cfg_fo.flush()
+        os.fsync(mnt_cfg_fo.fileno())
+    shutil.copymode(mounts_cfg, mnt_cfg_fo.name)
+    os.replace(mnt_cfg_fo.name, mounts_cfg)
 
 
 def update_mounts(args):
@@ -718,19 +876,92 @@ def update_mounts(args):
         args (Namespace object)
     """
     raft_cfg = load_raft_cfg()
-    bind_dirs = []
-    to_check = glob(pjoin(os.path.abspath(args.dir), "**", "*"), recursive=True)
-    for fle in to_check:
-        bind_dirs.append(os.path.dirname(os.path.realpath(fle)))
-
-    bind_dirs = list(set(bind_dirs))
+    bind_dirs = set()
+    # Files within a directory share its resolution, so resolve each
+    # directory once for this run.
+    realpath_dir = functools.lru_cache(maxsize=None)(os.path.realpath)
+    for entry in scandir_walk(os.path.abspath(args.dir)):
+        # Only symlinks need resolving; everything else lives in a (resolved)
+        # directory we're already walking.
+        if entry.is_symlink():
+            bind_dirs.add(os.path.dirname(os.path.realpath(entry.path)))
+        else:
+            bind_dirs.add(realpath_dir(os.path.dirname(entry.path)))
 
     if bind_dirs:
         update_mounts_cfg(pjoin(raft_cfg['filesystem']['projects'],
                                 args.project_id,
                                 'workflow',
                                 'mounts.config'),
-                          bind_dirs)
+                          list(bind_dirs))
+
+
+def scandir_walk(path, hidden=False):
+    """
+    Recursively yields DirEntry objects beneath path. Mirrors
+    glob(pjoin(path, '**', '*'), recursive=True): hidden entries are skipped
+    and symlinked directories are followed. To avoid symlink cycles, each real
+    directory is entered through symlinks at most once; like glob, a
+    directory reachable both directly and through a symlink is walked under
+    both paths.
+
+    DirEntry caches file type information from the directory listing, so
+    callers can check is_symlink()/is_dir()/is_file() without extra stats.
+
+    Args:
+        path (str): Directory to walk.
+        hidden (bool): Also yield hidden entries (hidden directories are
+                       still not descended into).
+
+    Yields:
+        DirEntry objects for every entry beneath path.
+    """
+    seen = {os.path.realpath(path)}
+    stack = [path]
+    while stack:
+        directory = stack.pop()
+        try:
+            dir_it = os.scandir(directory)
+        except OSError:
+            continue
+        with dir_it:
+            for entry in dir_it:
+                if entry.name.startswith('.'):
+                    if hidden:
+                        yield entry
+                    continue
+                yield entry
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_symlink() and entry.is_dir():
+                    real_dir = os.path.realpath(entry.path)
+                    if real_dir not in seen:
+                        seen.add(real_dir)
+                        stack.append(entry.path)
+
+
+def scandir_rglob(root, pattern):
+    """
+    scandir-based equivalent of glob(pjoin(root, '**', pattern),
+    recursive=True). Yields DirEntry objects so callers can reuse their
+    cached type information rather than stat-ing each path again.
+
+    Args:
+        root (str): Directory to search.
+        pattern (str): Glob pattern (may include a directory prefix).
+
+    Yields:
+        DirEntry objects whose trailing path components match pattern.
+    """
+    pattern_parts = [part for part in pattern.split(os.sep) if part]
+    if not pattern_parts:
+        return
+    for entry in scandir_walk(root, hidden=pattern_parts[-1].startswith('.')):
+        parts = os.path.relpath(entry.path, root).split(os.sep)
+        if (len(parts) >= len(pattern_parts) and
+                all(fnmatch(part, pattern_part)
+                    for part, pattern_part in zip(parts[-len(pattern_parts):], pattern_parts))):
+            yield entry
 
 
 def load_metadata(args):
@@ -782,7 +1013,7 @@ def load_files(args, out_dir):
 
     full_base = raft_cfg['filesystem'][base]
 
-    globbed_files =  glob(pjoin(full_base, '**', args.file), recursive=True)
+    globbed_files = [entry.path for entry in scandir_rglob(full_base, args.file)]
     if len(globbed_files) == 0:
         sys.exit(f"Cannot find {args.file} in {full_base}/**")
         # Put list of available references here.
@@ -810,8 +1041,41 @@ def load_files(args, out_dir):
                           [os.path.realpath(globbed_file)])
 
     elif args.mode == 'copy':
-        shutil.copyfile(os.path.realpath(globbed_file),
-                        result_file)
+        fast_copy(os.path.realpath(globbed_file),
+                  result_file)
+
+
+def fast_copy(src, dst):
+    """
+    Copies the contents of src to dst using copy_file_range(2) where
+    available. This lets the kernel copy (or reflink, or perform a
+    server-side NFS copy) without moving data through user space. Falls back
+    to shutil.copyfile() when copy_file_range is unavailable or unsupported,
+    or when it stops short of the source size (some filesystems, e.g. procfs
+    and some FUSE mounts, report 0 bytes copied instead of an error). Empty
+    sources are always copied with shutil.copyfile().
+
+    Args:
+        src (str): Source file path.
+        dst (str): Destination file path.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src} and {dst} are the same file")
+    try:
+        with open(src, 'rb') as src_fo, open(dst, 'wb') as dst_fo:
+            src_size = os.fstat(src_fo.fileno()).st_size
+            copied = 0
+            while copied < src_size:
+                count = os.copy_file_range(src_fo.fileno(), dst_fo.fileno(), 1 << 30)
+                if not count:
+                    break
+                copied += count
+    except (AttributeError, OSError):
+        shutil.copyfile(src, dst)
+        return
+    # A size of 0 may just mean the size is unknown (e.g. procfs).
+    if not src_size or copied < src_size:
+        shutil.copyfile(src, dst)
 
 
 def recurs_load_modules(args):
@@ -828,28 +1092,35 @@ def recurs_load_modules(args):
     """
     raft_cfg = load_raft_cfg()
     wf_dir = pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'workflow')
+
+    def loaded_modules():
+        with os.scandir(wf_dir) as wf_it:
+            return {entry.name for entry in wf_it if entry.is_dir()}
+
     new_deps = 1
     while new_deps == 1:
         new_deps = 0
         mods = glob(pjoin(wf_dir, '**', "{}.nf".format(args.module)), recursive=True)
+        deps = []
         for mod in mods:
-            deps = []
             with open(mod, encoding='utf8') as mfo:
                 for line in mfo:
-                    if re.search('^include.*nf.*', line):
+                    if line.startswith('include') and INCLUDE_RE.search(line):
                         dep = line.split()[-1].replace("'", '').split('/')[1]
                         # Adding the negative regex to avoid capturing /tests
                         # include statements.
-                        if dep not in deps and not(re.search('.nf$', dep)): 
+                        if dep not in deps and not NF_SUFFIX_RE.search(dep):
                             deps.append(dep)
         if deps:
+            curr_deps = loaded_modules()
             for dep in deps:
-                curr_deps = [i.split('/')[-1] for i in glob(pjoin(wf_dir, '*'))]
                 if dep not in curr_deps:
                     new_deps = 1
                     spoofed_args = args
                     spoofed_args.module = dep
                     load_module(spoofed_args)
+                    # Loading may pull in further dependencies.
+                    curr_deps = loaded_modules()
 
 
 def list_steps(args):
@@ -862,6 +1133,7 @@ def list_steps(args):
        args (Namespace object): User-provided arguments
     """
     indexable_lines = []
+    require_idxs = []
     lois = {}
     output = []
     raft_cfg = load_raft_cfg()
@@ -870,34 +1142,43 @@ def list_steps(args):
     if args.module:
         glob_term = args.module + '/'
 
+    step_re = None
+    if args.step:
+        step_re = re.compile(re.escape(args.step) + ' ')
+
     globbed_mods = glob(pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'workflow', glob_term))
     for mod in globbed_mods:
         with open(pjoin(mod, mod.split('/')[-2] + '.nf'), encoding='utf8') as mod_fo:
-            for line_idx, line in enumerate(mod_fo.readlines()):
+            for line in mod_fo:
                 line = line.strip()
-                indexable_lines.append(line) 
+                # Index into indexable_lines (which spans all globbed modules).
+                line_idx = len(indexable_lines)
+                indexable_lines.append(line)
                 comment = ''
-                if re.search('^workflow', line):
+                if line == "// require:":
+                    require_idxs.append(line_idx)
+                elif line.startswith('workflow'):
                     if not(args.step):
                         comment = f"module: {mod.split('/')[-2]}\ntype: workflow\nstep: {line.split(' ')[1]}"
                         lois[comment] = line_idx
-                    elif args.step and re.search("{} ".format(args.step), line):
+                    elif step_re.search(line):
                         comment = f"module: {mod.split('/')[-2]}\ntype: workflow\nstep: {line.split(' ')[1]}"
                         lois[comment] = line_idx
                      
-                elif re.search('^process', line):
+                elif line.startswith('process'):
                     if not(args.step):
                         comment = f"module: {mod.split('/')[-2]}\ntype: process\nstep: {line.split(' ')[1]}"
                         lois[comment] = line_idx
-                    elif args.step and re.search("{} ".format(args.step), line):
+                    elif step_re.search(line):
                         comment = f"module: {mod.split('/')[-2]}\ntype: process\nstep: {line.split(' ')[1]}"
                         lois[comment] = line_idx
 
+    # require_idxs is ascending, so the next "// require:" is found by bisection.
     for loi in lois:
         start_idx = lois[loi]
-        stop_idx = indexable_lines[start_idx:].index("// require:")
+        stop_idx = require_idxs[bisect_left(require_idxs, start_idx)]
         output.append(loi)
-        output.append('\n'.join(indexable_lines[start_idx+1:start_idx+stop_idx]))
+        output.append('\n'.join(indexable_lines[start_idx+1:stop_idx]))
 
     print("{}".format('\n'.join(output)))
 
@@ -916,7 +1197,7 @@ def get_module_branch(args):
         branch (str): Branch requested for module.
     """
     branch = 'main'
-    if re.search(':', args.branches):
+    if ':' in args.branches:
         branch_lookup = {}
         arged_branches = args.branches.split(',')
         for combination in arged_branches:
@@ -1035,8 +1316,8 @@ def run_workflow(args):
 
 
     os.chdir(pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'logs'))
-    print(f"Running:\n{nf_cmd}")
-    nf_exit_code = subprocess.run(nf_cmd, shell=True, check=False)
+    print(f"Running:\n{' '.join(shlex.quote(component) for component in nf_cmd)}")
+    nf_exit_code = subprocess.run(nf_cmd, check=False)
 
     reports_dir = pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'outputs', 'reports')
 
@@ -1061,29 +1342,104 @@ def get_work_dirs(args):
     log_dir = pjoin(raft_cfg['filesystem']['projects'],
                     args.project_id, 'logs')
     project_uuid = ''
-    with open(pjoin(log_dir, '.nextflow', 'history'), encoding='utf8') as nf_hist_fo:
-        for line in reversed(nf_hist_fo.read().split('\n')):
-            if line:
-                line = line.split('\t')
-                if line[3] == 'OK':
-                    project_uuid = line[5]
-                    break
+    last_ok_run = get_last_ok_run(pjoin(log_dir, '.nextflow', 'history'))
+    if last_ok_run:
+        project_uuid = last_ok_run[5]
     os.chdir(pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'logs'))
-    work_dirs = [x for x in subprocess.run(f'nextflow log {project_uuid}', shell=True, check=False, capture_output=True).stdout.decode("utf-8").split('\n') if os.path.isdir(x)]
+    # Without a uuid, nextflow log reports the latest run.
+    nf_log_cmd = ['nextflow', 'log'] + ([project_uuid] if project_uuid else [])
+    work_dirs = filter_existing_dirs(subprocess.run(nf_log_cmd, check=False, capture_output=True).stdout.decode("utf-8").split('\n'))
     return work_dirs
 
 
+def get_last_ok_run(nf_hist, chunk_size=4096):
+    """
+    Gets the latest successful run from a Nextflow history file.
+
+    The history grows with every run but only its latest successful entry is
+    needed, so the file is read backwards from the end in chunks.
+
+    Args:
+        nf_hist (str): Path to .nextflow/history file.
+        chunk_size (int): Number of bytes read per chunk.
+
+    Returns:
+        List containing the fields of the latest run with status 'OK' (empty
+        if there is none).
+    """
+    with open(nf_hist, 'rb') as nf_hist_fo:
+        pos = nf_hist_fo.seek(0, os.SEEK_END)
+        partial = b''
+        while True:
+            read_size = min(chunk_size, pos)
+            pos -= read_size
+            nf_hist_fo.seek(pos)
+            lines = (nf_hist_fo.read(read_size) + partial).split(b'\n')
+            # The first line may continue in the preceding chunk.
+            partial = lines.pop(0) if pos else b''
+            for line in reversed(lines):
+                if line:
+                    line = line.decode('utf8').split('\t')
+                    if line[3] == 'OK':
+                        return line
+            if not pos:
+                return []
+
+
+def filter_existing_dirs(paths):
+    """
+    Filters paths down to those which are existing directories.
+
+    Nextflow work directories share a small number of parent directories, so
+    each parent is listed once with os.scandir rather than stat-ing every path.
+
+    Args:
+        paths (list): Paths to filter.
+
+    Returns:
+        List containing the paths (in order) which are existing directories.
+    """
+    parent_dirs = {}
+    existing_dirs = []
+    for path in paths:
+        parent, name = os.path.split(path)
+        if not name:
+            # e.g. '/' or a trailing separator.
+            if os.path.isdir(path):
+                existing_dirs.append(path)
+            continue
+        if parent not in parent_dirs:
+            try:
+                with os.scandir(parent or '.') as parent_it:
+                    parent_dirs[parent] = {entry.name for entry in parent_it if entry.is_dir()}
+            except OSError:
+                parent_dirs[parent] = set()
+        if name in parent_dirs[parent]:
+            existing_dirs.append(path)
+    return existing_dirs
+
+
 def get_size(start_path = '.'):
     """
     https://stackoverflow.com/a/1392549
     """
     total_size = 0
-    for dirpath, dirnames, filenames in os.walk(start_path):
-        for filename in filenames:
-            filename_path = os.path.join(dirpath, filename)
-            # skip if it is symbolic link
-            if not os.path.islink(filename_path):
-                total_size += os.path.getsize(filename_path)
+    stack = [start_path]
+    while stack:
+        try:
+            dir_it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with dir_it:
+            for entry in dir_it:
+                # skip if it is symbolic link (file type comes from the
+                # directory listing, so this costs no extra stat)
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    total_size += entry.stat(follow_symlinks=False).st_size
 
     return total_size
 
@@ -1095,14 +1451,14 @@ def add_global_fq_dir(samp_nf_cmd):
     Appends global fastq directory to Nextflow command.
 
     Args:
-        samp_nf_cmd (str): Sample-specific Nextflow command.
+        samp_nf_cmd (list): Sample-specific Nextflow command.
 
     Returns:
-        Str containing the modified Nextflow command with a working directory.
+        List containing the modified Nextflow command with a working directory.
     """
     raft_cfg = load_raft_cfg()
     global_fq_dir = raft_cfg['filesystem']['fastqs']
-    return ' '.join([samp_nf_cmd, f'--global_fq_dir {global_fq_dir}'])
+    return samp_nf_cmd + ['--global_fq_dir', global_fq_dir]
 
 
 def add_global_shared_dir(samp_nf_cmd):
@@ -1112,14 +1468,14 @@ def add_global_shared_dir(samp_nf_cmd):
     Appends global fastq directory to Nextflow command.
 
     Args:
-        samp_nf_cmd (str): Sample-specific Nextflow command.
+        samp_nf_cmd (list): Sample-specific Nextflow command.
 
     Returns:
-        Str containing the modified Nextflow command with a working directory.
+        List containing the modified Nextflow command with a working directory.
     """
     raft_cfg = load_raft_cfg()
     shared_dir = raft_cfg['filesystem']['shared']
-    return ' '.join([samp_nf_cmd, f'--shared_dir {shared_dir}'])
+    return samp_nf_cmd + ['--shared_dir', shared_dir]
 
 
 def add_nf_work_dir(work_dir, nf_cmd):
@@ -1130,12 +1486,12 @@ def add_nf_work_dir(work_dir, nf_cmd):
 
     Args:
         work_dir (str): Work directory path to be appended.
-        nf_cmd (str): Nextflow command.
+        nf_cmd (list): Nextflow command.
 
     Returns:
-        Str containing the modified Nextflow command with a working directory.
+        List containing the modified Nextflow command with a working directory.
     """
-    return ' '.join([nf_cmd, f'-w {work_dir}'])
+    return nf_cmd + ['-w', work_dir]
 
 
 def get_base_nf_cmd(args):
@@ -1152,19 +1508,17 @@ def get_base_nf_cmd(args):
         samp_nf_cmd (str): Nextflow command.
 
     Returns:
-        Str containing modified Nextflow command with execution portion.
+        List containing modified Nextflow command with execution portion.
     """
     raft_cfg = load_raft_cfg()
 
-    # Processing nf-params
-    cmd = []
+    # Processing nf-params (split as the shell would, honoring quotes). The
+    # command no longer goes through a shell, so expand $VARs and ~ here.
+    # Globs are not expanded.
+    nf_params = []
     if args.nf_params:
-        cmd = args.nf_params.split(' ')
-    new_cmd = []
-    # Should this be in its own additional function?
-    for component in cmd:
-        # Do any processing here.
-        new_cmd.append(component)
+        nf_params = [os.path.expanduser(os.path.expandvars(component))
+                     for component in shlex.split(args.nf_params)]
 
     #Discovering workflow script
     workflow_dir = pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'workflow')
@@ -1172,18 +1526,16 @@ def get_base_nf_cmd(args):
     discovered_nf = glob(pjoin(workflow_dir, 'main.nf'))[0]
 
     # Adding project directory
-    proj_dir_str = ''
     proj_dir = pjoin(raft_cfg['filesystem']['projects'], args.project_id)
-    proj_dir_str = f"--project_dir {proj_dir}"
 
     # Adding all components to make base command.
-    resume = ''
-    reports = ''
+    resume = []
+    reports = []
     if not args.no_resume:
-        resume = '-resume'
+        resume = ['-resume']
     if not args.no_reports:
-        reports = '-with-trace -with-report -with-dag -with-timeline'
-    cmd = ' '.join(['nextflow -Dnxf.pool.type=sync run', discovered_nf, ' '.join(new_cmd), proj_dir_str, resume, reports])
+        reports = ['-with-trace', '-with-report', '-with-dag', '-with-timeline']
+    cmd = ['nextflow', '-Dnxf.pool.type=sync', 'run', discovered_nf] + nf_params + ['--project_dir', proj_dir] + resume + reports
     return cmd
 
 
@@ -1202,29 +1554,29 @@ def update_nf_cfg(nf_cfg, mod_cfg):
         nf_cfg (str): Path to nextflow.config to be updated.
         comp_cfg (str): Path to component config file to use for updating nextflow.config.
     """
-    new_nf_cfg = []
-    lines_to_copy = []
-    with open(mod_cfg, encoding='utf8') as mfo:
-        for line in mfo:
-            if line not in ["process {\n", "}\n"]:
-                lines_to_copy.append(line)
-
+    # Streaming into a temporary file alongside nf_cfg and then replacing
+    # nf_cfg keeps the update atomic.
     with open(nf_cfg, encoding='utf8') as nfo:
-        for line in nfo:
-            new_nf_cfg.append(line)
-            if line == "process {\n":
-                new_nf_cfg.extend(lines_to_copy)
-
-    with open(nf_cfg, 'w', encoding='utf8') as nfo:
-        for line in new_nf_cfg:
-            nfo.write(line)
+        with tempfile.NamedTemporaryFile('w', encoding='utf8', dir=os.path.dirname(nf_cfg), delete=False) as tmp_fo:
+            for line in nfo:
+                tmp_fo.write(line)
+                if line == "process {\n":
+                    with open(mod_cfg, encoding='utf8') as mfo:
+                        tmp_fo.writelines(mline for mline in mfo if mline not in ("process {\n", "}\n"))
+    # NamedTemporaryFile is created 0600, so carry over nf_cfg's permissions.
+    shutil.copymode(nf_cfg, tmp_fo.name)
+    os.replace(tmp_fo.name, nf_cfg)
 
 
 def rndm_str_gen(k=5):
     """
     Creates a random k-mer.
+
+    random is only needed by package-project, so it's imported here rather
+    than on every RAFT invocation.
     """
-    return ''.join(random.choice(string.ascii_uppercase + string.digits) for i in range(k))
+    import random
+    return ''.join(random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789') for i in range(k))
 
 
 def load_raft_cfg():
@@ -1238,14 +1590,37 @@ def load_raft_cfg():
     """
     cfg = {}
     cfg_path = pjoin(getcwd(), '.raft.cfg')
-    if os.path.isfile(cfg_path):
-        with open(cfg_path, encoding='utf8') as cfg_fo:
-            cfg = json.load(cfg_fo)
-    else:
+    try:
+        cfg_stat = os.stat(cfg_path)
+    except (FileNotFoundError, NotADirectoryError):
         sys.exit("Cannot find RAFT configuration file.\nPlease run raft.py in your RAFT installation directory.")
+    cfg = read_raft_cfg(cfg_path, cfg_stat.st_mtime_ns, cfg_stat.st_size)
     return cfg
 
 
+@functools.lru_cache(maxsize=1)
+def read_raft_cfg(cfg_path, mtime_ns, size):
+    """
+    Part of several modes.
+
+    Reads and parses the RAFT configuration file. Nearly every mode calls
+    load_raft_cfg() (often repeatedly), so parsed configurations are cached.
+    The modification time and size are part of the cache key so a rewritten
+    configuration file is re-read. The returned dictionary is shared between
+    callers and must not be modified.
+
+    Args:
+        cfg_path (str): Path to .raft.cfg.
+        mtime_ns (int): Modification time (ns) of cfg_path.
+        size (int): Size (bytes) of cfg_path.
+
+    Returns:
+        Dictionary with configuration information.
+    """
+    with open(cfg_path, 'rb') as cfg_fo:
+        return json_loads(cfg_fo.read())
+
+
 def dump_to_auto_raft(args):
     """
     Part of several modes.
@@ -1256,16 +1631,14 @@ def dump_to_auto_raft(args):
     Args:
         args (Namespace object): User-specified arguments.
     """
-    if args.command and args.command not in ['init-project', 'run-auto', 'package-project',
-                                             'load-project', 'setup', 'push-project',
-                                             'rename-project', 'run-workflow', 'copy-parameters']:
+    if args.command and args.command not in ADMIN_CMDS:
         raft_cfg = load_raft_cfg()
         auto_raft_path = pjoin(raft_cfg['filesystem']['projects'],
                                args.project_id,
                                '.raft',
                                'auto.raft')
         comment_out = ''
-        if args.command in ['add-step']:
+        if args.command == 'add-step':
             comment_out = '#'
         with open(auto_raft_path, 'a', encoding='utf8') as auto_raft_fo:
             auto_raft_fo.write(f"{comment_out}{' '.join(sys.argv)}\n")
@@ -1276,25 +1649,27 @@ def snapshot_postproc(inf, outf):
     Strips out repeated steps from snapshot so auto-run can run as expected.
 
     This may be overly aggressive, but can modify it later.
+
+    The snapshot is streamed line-by-line; only the previous line is held so
+    a trailing run-workflow step can be rewritten.
     """
     with open(outf, 'w', encoding='utf8') as ofo:
         with open(inf, encoding='utf8') as ifo:
-            new_contents = []
-            contents = ifo.readlines()
-            for line_idx, line in enumerate(contents):
-                if not re.search("run-workflow", line):
-                    new_contents.append(line)
-                elif line_idx == len(contents) - 1:
-                    line = line.strip().replace('n=', 'n="')
-                    #print(line)
-                    if re.search('-profile', line):
-                        spl = line.split(' ')
-                        ind =  [i for i, word in enumerate(spl) if re.search('-profile', word)]
+            prev_line = None
+            for line in ifo:
+                if prev_line is not None and not RUN_WF_RE.search(prev_line):
+                    ofo.write(prev_line)
+                prev_line = line
+            if prev_line is not None:
+                if RUN_WF_RE.search(prev_line):
+                    prev_line = prev_line.strip().replace('n=', 'n="')
+                    if PROFILE_RE.search(prev_line):
+                        spl = prev_line.split(' ')
+                        ind = [i for i, word in enumerate(spl) if PROFILE_RE.search(word)]
                         spl[ind[0] + 1] = "RAFT_PROFILE_PLACEHOLDER"
-                        line = ' '.join(spl)
-                new_contents.append(line + '"\n')
-            for line in new_contents:
-                ofo.write(line)
+                        prev_line = ' '.join(spl)
+                    prev_line = prev_line + '"\n'
+                ofo.write(prev_line)
 
 
 def package_project(args):
@@ -1310,15 +1685,13 @@ def package_project(args):
 
     # Copying metadata directory. Should probably perform some size checks here.
     os.mkdir(pjoin(proj_tmp_dir, 'metadata'))
-    metadata_files = glob(pjoin(proj_dir, 'metadata', '**'), recursive=True)
-    for mfile in metadata_files:
-        mfilel = mfile.split('/')
-        msuffix = '/'.join(mfilel[mfilel.index('metadata')+1:])
-        if not os.path.islink(mfile) and not os.path.isdir(mfile):
-            basedir = pjoin(proj_tmp_dir, 'metadata', os.path.dirname(msuffix))
-            if '/' in msuffix:
-                os.makedirs(pjoin(proj_tmp_dir, 'metadata', os.path.dirname(msuffix)))
-            shutil.copyfile(mfile, pjoin(proj_tmp_dir, 'metadata', msuffix))
+    metadata_dir = pjoin(proj_dir, 'metadata')
+    for mentry in scandir_walk(metadata_dir):
+        if not mentry.is_symlink() and not mentry.is_dir():
+            msuffix = os.path.relpath(mentry.path, metadata_dir)
+            if os.sep in msuffix:
+                os.makedirs(pjoin(proj_tmp_dir, 'metadata', os.path.dirname(msuffix)), exist_ok=True)
+            fast_copy(mentry.path, pjoin(proj_tmp_dir, 'metadata', msuffix))
 
     # Getting required checksums. Currently only doing /datasets, but should
     # probably do other directories produced by workflow as well.
@@ -1327,10 +1700,14 @@ def package_project(args):
         hashes = {}
         with open(pjoin(proj_tmp_dir, 'checksums'), 'w', encoding='utf8') as checksums_fo:
             hashes = {}
+            files = []
             for directory in dirs:
-                files = glob(pjoin('projects', args.project_id, directory, '**'), recursive=True)
-                sub_hashes = {file: md5(file) for file in files if os.path.isfile(file)}
-                hashes.update(sub_hashes)
+                files.extend([entry.path for entry in scandir_walk(pjoin('projects', args.project_id, directory))
+                              if entry.is_file()])
+            # Hashing is I/O heavy (and projects often live on NFS), so files
+            # are hashed concurrently to overlap reads with hashing.
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+                hashes = dict(zip(files, executor.map(md5, files)))
             json.dump(hashes, checksums_fo, indent=4)
 
     # Get Nextflow configs, etc.
@@ -1345,36 +1722,61 @@ def package_project(args):
                             pjoin(proj_tmp_dir, 'workflow', os.path.basename(wf_dir)),
                             ignore=shutil.ignore_patterns(igpat))
         else:
-            shutil.copyfile(wf_dir,
-                            pjoin(proj_tmp_dir, 'workflow', os.path.basename(wf_dir)))
+            fast_copy(wf_dir,
+                      pjoin(proj_tmp_dir, 'workflow', os.path.basename(wf_dir)))
 
     # Get auto.raft
-    shutil.copyfile(pjoin(proj_dir, '.raft', 'auto.raft'),
-                    pjoin(proj_dir, '.raft', 'snapshot.raft.actual'))
+    fast_copy(pjoin(proj_dir, '.raft', 'auto.raft'),
+              pjoin(proj_dir, '.raft', 'snapshot.raft.actual'))
     snapshot_postproc(pjoin(proj_dir, '.raft', 'snapshot.raft.actual'),
                       pjoin(proj_dir, '.raft', 'snapshot.raft.postproc'))
 
-    shutil.copyfile(pjoin(proj_dir, '.raft', 'snapshot.raft.postproc'),
-                    pjoin(proj_tmp_dir, 'snapshot.raft'))
-    shutil.copyfile(pjoin(proj_dir, '.raft', 'snapshot.raft.actual'),
-                    pjoin(proj_tmp_dir, 'snapshot.raft.actual'))
+    fast_copy(pjoin(proj_dir, '.raft', 'snapshot.raft.postproc'),
+              pjoin(proj_tmp_dir, 'snapshot.raft'))
+    fast_copy(pjoin(proj_dir, '.raft', 'snapshot.raft.actual'),
+              pjoin(proj_tmp_dir, 'snapshot.raft.actual'))
 
     rftpkg = ''
     if args.output:
         rftpkg = pjoin(proj_dir, 'rftpkgs', args.output + '.rftpkg')
     else:
         rftpkg = pjoin(proj_dir, 'rftpkgs', 'default.rftpkg')
-    with tarfile.open(rftpkg, 'w', encoding='utf8') as taro:
-        for i in os.listdir(proj_tmp_dir):
-            #print(i)
-            taro.add(os.path.join(proj_tmp_dir, i), arcname = i)
+    # Stream the archive sequentially through a large write buffer. The
+    # archive is written alongside and then swapped in, since push-project
+    # hard links the previous rftpkg into the project's git repository and
+    # truncating it in place would change the committed copy too.
+    tmp_rftpkg = f"{rftpkg}.{rndm_str_gen()}.tmp"
+    rftpkg_fo = open(tmp_rftpkg, 'xb', buffering=8*1024*1024)
+    try:
+        with rftpkg_fo, tarfile.open(fileobj=rftpkg_fo, mode='w|', encoding='utf8') as taro:
+            for i in os.listdir(proj_tmp_dir):
+                #print(i)
+                taro.add(os.path.join(proj_tmp_dir, i), arcname = i)
+        os.replace(tmp_rftpkg, rftpkg)
+    except BaseException:
+        os.remove(tmp_rftpkg)
+        raise
 
 
 def md5(fname):
-#https://stackoverflow.com/a/3431838
-    hash_md5 = hashlib.md5()
-    with open(fname, "rb", encoding='utf8') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+    """
+    Computes the md5 checksum of a file.
+
+    Uses hashlib.file_digest (Python 3.11+) when available, otherwise hashes
+    the file in 1 MiB chunks.
+    https://stackoverflow.com/a/3431838
+
+    Args:
+        fname (str): File path.
+
+    Returns:
+        Str containing hex digest of file.
+    """
+    with open(fname, "rb") as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'md5').hexdigest()
+        hash_md5 = hashlib.md5()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
             hash_md5.update(chunk)
     return hash_md5.hexdigest()
 
@@ -1419,16 +1821,20 @@ def load_project(args):
     tar.extractall(os.path.join(raft_cfg['filesystem']['projects'], args.project_id, '.raft'))
     tar.close()
 
+    # Extracted directories are moved (a rename on the same filesystem)
+    # rather than copied into place.
     for dir in ['metadata', 'workflow']:
         shutil.rmtree(pjoin(raft_cfg['filesystem']['projects'], args.project_id, dir))
-        shutil.copytree(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', dir),
-                        pjoin(raft_cfg['filesystem']['projects'], args.project_id, dir))
+        shutil.move(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', dir),
+                    pjoin(raft_cfg['filesystem']['projects'], args.project_id, dir))
     shutil.move(pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'workflow', 'mounts.config'),
                 pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'workflow', '.mounts.config.orig'))
     shutil.move(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.mounts.config'),
                 pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'workflow', 'mounts.config'))
 
     # Create back-up of snapshot.raft and checksums
+    shutil.copyfile(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', 'snapshot.raft'),
+                    pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', 'snapshot.raft.orig'))
 
     if os.path.isfile(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', 'checksums')):
         shutil.copyfile(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', 'checksums'),
@@ -1440,10 +1846,6 @@ def load_project(args):
     else:
         print("Checksums file not found within RFTPKG. Checksums cannot be checked.")
 
-
-    shutil.copyfile(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', 'snapshot.raft'),
-                    pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', 'snapshot.raft.orig'))
-
     orig_proj_id = get_orig_prod_id(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', 'snapshot.raft'))
 
     replace_proj_id(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', 'snapshot.raft'), get_orig_prod_id(pjoin(raft_cfg['filesystem']['projects'], args.project_id, '.raft', 'snapshot.raft.orig')), args.project_id)
@@ -1452,24 +1854,21 @@ def load_project(args):
 def replace_proj_id(fle, old_proj_id, new_proj_id):
     """
     """
-    raft_cfg = load_raft_cfg()
-    with open(pjoin(raft_cfg['filesystem']['projects'], new_proj_id, 'tmp', 'tmp_file'), 'w', encoding='utf8') as tfo:
-        with open(fle, encoding='utf8') as ffo:
-            contents = ffo.readlines()
-            for line in contents:
-                line = line.replace(f'-p {old_proj_id}', f'-p {new_proj_id}')
-                line = line.replace(f'projects/{old_proj_id}', f'projects/{new_proj_id}')
-                tfo.write(line)
-
-    shutil.move(pjoin(raft_cfg['filesystem']['projects'], new_proj_id, 'tmp', 'tmp_file'), fle)
+    opt_old, opt_new = (f'-p {old_proj_id}', f'-p {new_proj_id}')
+    path_old, path_new = (f'projects/{old_proj_id}', f'projects/{new_proj_id}')
+    with open(fle, encoding='utf8') as ffo:
+        with tempfile.NamedTemporaryFile('w', encoding='utf8', dir=os.path.dirname(fle), delete=False) as tfo:
+            for line in ffo:
+                tfo.write(line.replace(opt_old, opt_new).replace(path_old, path_new))
+    shutil.copymode(fle, tfo.name)
+    os.replace(tfo.name, fle)
 
 
 def get_orig_prod_id(fle):
     """
     """
     with open(fle, encoding='utf8') as ffo:
-        contents = ffo.readlines()
-        first = contents[0].strip()
+        first = next(ffo).strip()
         ind = ''
         ind = first.split(' ').index('-p')
         if not ind:
@@ -1477,41 +1876,74 @@ def get_orig_prod_id(fle):
         return first.split(' ')[ind+1]
 
 
-def get_params_from_module(module_path):
+def get_section_insert_idx(contents, section, stop='\n'):
     """
-    Extracta parameters from a module.
+    Part of add-step mode.
+
+    Find the index of the nearest empty row for a section. Basically, find
+    where the the a set of rows should be inserted within a main.nf specific
+    section.
 
     Args:
-      module_path (str): Module path.
+        contents (str): Contents of main.nf.
+        section (str): Row (including newline) starting the section.
+        stop (str): Row (including newline) before which rows are inserted.
 
     Returns:
-      undef_params (list): Parameters not defined within module.
-      defined_params (list): Parameters defined within module.
+        Int offset within contents at which rows should be inserted.
     """
-    undef_params, defined_params = ([], [])
-    with open(module_path, encoding='utf8') as mfo:
-        for line in mfo.readlines():
-            line = line.rstrip()
-            if re.search("^params.*", line):
-                if re.search(" = ''", line):
-                    undef_params.append(line.partition(' ')[0])
-                else:
-                    defined_params.append(line.partition(' ')[0])
-
-    return undef_params, defined_params
+    # Both section and stop must match entire rows.
+    if contents.startswith(section):
+        start = 0
+    else:
+        start = contents.index('\n' + section) + 1
+    return contents.index('\n' + stop, start) + 1
 
 
-def get_section_insert_idx(contents, section, stop='\n'):
+def parse_main_nf(main_nf):
     """
     Part of add-step mode.
 
-    Find the index of the nearest empty row for a section. Basically, find
-    where the the a set of rows should be inserted within a main.nf specific
-    section.
+    Reads main.nf once and collects everything add-step needs from it: its
+    rows and parameters from a single pass (parameters assigned '' are
+    undefined), and the insertion offset of each section (from
+    get_section_insert_idx()).
+
+    Args:
+        main_nf (str): Path to main.nf.
+
+    Returns:
+        Namespace object with:
+            contents (str): Contents of main.nf.
+            rows (set): Rows (including newlines) within main.nf.
+            undef_params (list): Parameters not defined within main.nf.
+            defined_params (list): Parameters defined within main.nf.
+            insert_idxs (dict): Keys are section headers and values are the
+                                offsets at which rows for that section should
+                                be inserted.
     """
-    start = contents.index(section)
-    insert_idx = contents[start:].index(stop)
-    return start + insert_idx
+    with open(main_nf, encoding='utf8') as mfo:
+        contents = mfo.read()
+    rows = set()
+    undef_params, defined_params = ([], [])
+    for line in io.StringIO(contents):
+        rows.add(line)
+        if line.startswith('params'):
+            param = line.rstrip().partition(' ')[0]
+            if " = ''" in line:
+                undef_params.append(param)
+            else:
+                defined_params.append(param)
+    insert_idxs = {section: get_section_insert_idx(contents, section, stop)
+                   for section, stop in (("/*Inclusions*/\n", '\n'),
+                                         ("/*Parameters*/\n", '\n'),
+                                         ("workflow {\n", "}\n"))}
+
+    return argparse.Namespace(contents=contents,
+                              rows=rows,
+                              undef_params=undef_params,
+                              defined_params=defined_params,
+                              insert_idxs=insert_idxs)
 
 
 def get_wf_mod_map(args):
@@ -1526,10 +1958,17 @@ def get_wf_mod_map(args):
     """
     raft_cfg = load_raft_cfg()
     wf_mod_map = {}
-    nf_scripts = glob(pjoin(raft_cfg['filesystem']['projects'],
-                            args.project_id,
-                            'workflow',
-                            '*/*.nf'))
+    wf_dir = pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'workflow')
+    nf_scripts = []
+    # Equivalent to glob('workflow/*/*.nf'), using DirEntry file types rather
+    # than a stat per candidate.
+    with os.scandir(wf_dir) as wf_it:
+        for mod_entry in wf_it:
+            if mod_entry.name.startswith('.') or not mod_entry.is_dir():
+                continue
+            with os.scandir(mod_entry.path) as mod_it:
+                nf_scripts.extend(entry.path for entry in mod_it
+                                  if entry.name.endswith('.nf') and not entry.name.startswith('.'))
     for nf_script in nf_scripts:
         workflows = extract_wfs_from_script(nf_script)
         for workflow in workflows:
@@ -1549,9 +1988,25 @@ def extract_wfs_from_script(script_path):
         wfs (list): Workflows contained in Nextflow module.
     """
     wfs = []
-    with open(script_path, encoding='utf8') as spo:
-        for line in spo:
-            if re.search('^workflow', line):
+    with open(script_path, 'rb') as spo:
+        try:
+            script_mm = mmap.mmap(spo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped (and contain no workflows).
+            return wfs
+        with script_mm:
+            # Locate rows starting with 'workflow' with mmap.find rather than
+            # iterating over every row of the module.
+            line_starts = [0] if script_mm[:8] == b'workflow' else []
+            nl_idx = script_mm.find(b'\nworkflow')
+            while nl_idx != -1:
+                line_starts.append(nl_idx + 1)
+                nl_idx = script_mm.find(b'\nworkflow', nl_idx + 1)
+            for line_start in line_starts:
+                line_end = script_mm.find(b'\n', line_start)
+                if line_end == -1:
+                    line_end = len(script_mm)
+                line = script_mm[line_start:line_end].decode('utf8')
                 wfs.append(line.replace('workflow ', '').split('{')[0].strip())
     return wfs
 
@@ -1576,10 +2031,9 @@ def add_step(args):
                    args.module,
                    args.module + '.nf')
 
-    # Load main.nf contents
-    main_contents = []
-    with open(main_nf, encoding='utf8') as mfo:
-        main_contents = mfo.readlines()
+    # Load main.nf contents. Parameters, existing rows and section insertion
+    # points all come from this single read.
+    main = parse_main_nf(main_nf)
 
     print("Making backup of project's main.nf...")
     shutil.copyfile(main_nf, main_nf + '.bak')
@@ -1592,8 +2046,7 @@ def add_step(args):
 
     # Need to load main.nf params here to check against when getting step-specific params.
     # Seems odd to emit the undefined and defined separately.
-    main_undef_params, main_defined_params = get_params_from_module(main_nf)
-    main_params = main_undef_params + main_defined_params
+    main_params = main.undef_params + main.defined_params
 
     # Extract step contents from step's module file in order to make string to
     # put within main.nf
@@ -1601,65 +2054,73 @@ def add_step(args):
     step_slice = extract_step_slice_from_nfscript(mod_nf, args.step)
     if not step_slice:
         sys.exit(f"ERROR: Step {args.step} could not be found in module {args.module}.")
-    if re.search('workflow', step_slice[0]):
+    if step_slice[0].startswith('workflow'):
         step_str = get_workflow_str(step_slice)
-    elif re.search('process', step_slice[0]):
+    elif step_slice[0].startswith('process'):
         step_str = get_process_str(step_slice)
     if args.alias:
         params = step_str.partition('(')[2]
         step_str = ''.join([args.alias, '(', params]).replace(args.step, args.alias)
-    pprint_step = ''
-    if args.alias:
-        pprint_step = ',\n  '.join([x for x in step_str.rstrip().split(', ')]).replace('(', '(\n  ').replace(args.step, args.alias)
-    else:
-        pprint_step = ',\n  '.join([x for x in step_str.rstrip().split(', ')]).replace('(', '(\n  ')
+    # step_str is already aliased at this point.
+    pprint_step = ',\n  '.join(step_str.rstrip().split(', ')).replace('(', '(\n  ')
     print("Adding the following step to main.nf:")
     print(f"{pprint_step}")
 
     # Parameterization
     all_step_params = []
-    if re.search('workflow', step_slice[0]):
+    if step_slice[0].startswith('workflow'):
         wf_mod_map = get_wf_mod_map(args)
-        final_steps = []
-        discoverd_steps = [args.step]
+        # Keys are the discovered steps (in discovery order) and values are
+        # their slices, so each slice is extracted once.
+        final_step_slices = {}
+        discoverd_steps = deque([args.step])
         while discoverd_steps:
-            new_round_steps = []
-            for step in discoverd_steps:
-                step_slice = extract_step_slice_from_nfscript(wf_mod_map[step], step)
-                new_round_steps.extend([i.partition('(')[0] for i in step_slice if i.partition('(')[0] in wf_mod_map.keys()])
-                discoverd_steps.remove(step)
-                final_steps.append(step)
-            discoverd_steps.extend(new_round_steps)
-    
-        for step in final_steps:
+            step = discoverd_steps.popleft()
+            if step in final_step_slices:
+                continue
             step_slice = extract_step_slice_from_nfscript(wf_mod_map[step], step)
+            final_step_slices[step] = step_slice
+            discoverd_steps.extend([i.partition('(')[0] for i in step_slice if i.partition('(')[0] in wf_mod_map])
+    
+        for step, step_slice in final_step_slices.items():
             if step == args.step:
                 all_step_params.extend(extract_params_from_contents(step_slice, False))
             else:
                 all_step_params.extend(extract_params_from_contents(step_slice, True))
-    elif re.search('process', step_slice[0]):
+    elif step_slice[0].startswith('process'):
         all_step_params = get_process_params(step_slice)
 
     # Applying changes to main.nf
-    if step_str not in main_contents and inclusion_str not in main_contents:
+    if step_str not in main.rows and inclusion_str not in main.rows:
 
-        inc_idx = get_section_insert_idx(main_contents, "/*Inclusions*/\n")
-        main_contents.insert(inc_idx, inclusion_str)
-
-        params_idx = get_section_insert_idx(main_contents, "/*Parameters*/\n")
+        # Alias each parameter before de-duplicating so parameters which only
+        # become identical once aliased are added once.
         params_to_add = ''
-        if args.alias:
-            params_to_add = "{}\n".format('\n'.join(["{} = ''".format(x) for x in list(dict.fromkeys(all_step_params))]).replace(args.step, args.alias))
-        else:
-            params_to_add = "{}\n".format('\n'.join(["{} = ''".format(x) for x in list(dict.fromkeys(all_step_params))]))
-        main_contents.insert(params_idx, params_to_add)
-
-        wf_idx = get_section_insert_idx(main_contents, "workflow {\n", "}\n")
-        main_contents.insert(wf_idx, step_str.replace('(', '(\n  ').replace(', ', ',\n  '))
+        seen_params = set()
+        params_rows = []
+        for param in all_step_params:
+            if args.alias:
+                param = param.replace(args.step, args.alias)
+            if param not in seen_params:
+                seen_params.add(param)
+                params_rows.append(f"{param} = ''")
+        params_to_add = "{}\n".format('\n'.join(params_rows))
+
+        # Splice the additions in at the insertion offsets found above.
+        additions = sorted([(main.insert_idxs["/*Inclusions*/\n"], inclusion_str),
+                            (main.insert_idxs["/*Parameters*/\n"], params_to_add),
+                            (main.insert_idxs["workflow {\n"], step_str.replace('(', '(\n  ').replace(', ', ',\n  '))],
+                           key=lambda x: x[0])
+        pieces = []
+        prev_idx = 0
+        for idx, addition in additions:
+            pieces.extend([main.contents[prev_idx:idx], addition])
+            prev_idx = idx
+        pieces.append(main.contents[prev_idx:])
 
 
         with open(main_nf, 'w', encoding='utf8') as ofo:
-            ofo.write(''.join(main_contents))
+            ofo.write(''.join(pieces))
     else:
         print(f"Step {step_str.split('(')[0]} has already been added to Project {args.project_id}")
         print("Please use step aliasing (-a/--alias) if you intend to use this step multiple times.")
@@ -1681,7 +2142,7 @@ def is_workflow(step):
         True if step is a workflow, otherwise False.
     """
     is_workflow = False
-    if re.search('workflow', step[0]):
+    if step[0].startswith('workflow'):
         is_workflow = True
     return is_workflow
 
@@ -1700,10 +2161,11 @@ def find_step_module(contents, step):
         Str containing parent component for step.
     """
     mod = []
-    try:
-        mod = [re.findall(f'include .*{step}.*', i) for i in contents if re.findall(f'include .*{step}.*', i)][0][0].split('/')[1]
-    except FileNotFoundError:
-        pass
+    include_re = re.compile(f'include .*{re.escape(step)}.*')
+    # Only the first matching inclusion is needed.
+    include = next((found.group(0) for found in map(include_re.search, contents) if found), None)
+    if include:
+        mod = include.split('/')[1]
     return mod
 
 
@@ -1722,9 +2184,12 @@ def find_step_actual_and_alias(contents, step):
         Tuple containing parent component for step.
     """
     mod = []
+    include_re = re.compile(f'include .*{re.escape(step)}.*')
 
-    mod = [re.findall(f'include .*{step}.*', i) for i in contents if re.findall(f'include .*{step}.*', i)][0][0]
-    if not re.findall(' as ', mod):
+    # Only the first matching inclusion is needed. A step without one cannot
+    # be aliased.
+    mod = next((found.group(0) for found in map(include_re.search, contents) if found), '')
+    if ' as ' not in mod:
         actual = step
         alias = ''
     else:
@@ -1745,7 +2210,7 @@ def extract_steps_from_contents(contents):
     Args:
         contents (list): List containing the rows from a workflow's entry in a component.
     """
-    wfs = [re.findall('^[\w_]+\(.*', i) for i in contents if re.findall('^[\w_]+\(.*', i)]
+    wfs = [found for found in map(STEP_CALL_RE.findall, contents) if found]
     flat = [i.partition('(')[0] for j in wfs for i in j]
     return flat
 
@@ -1767,14 +2232,14 @@ def extract_params_from_contents(contents, discard_requires):
     contents_bfr = [x.strip() for x in contents]
     contents = contents_bfr
     require_params = []
-    if [re.findall("// require:", i) for i in contents if re.findall("// require:", i) for i in contents]:
+    if any("// require:" in i for i in contents):
         start = contents.index("// require:") + 1
         end = contents.index("take:")
 #        require_params = [i.replace('//   ','').split(',')[0] for i in contents[start:end] if re.search('^//   params', i)]
-    params = [re.findall("(params.*?,|params.*?\)|params.*\?})", i) for i in contents if
-              re.findall("params.*,|params.*\)", i) and i != 'params.']
-    params.append([i.replace('//   ','').split(',')[0] for i in contents[start:end] if re.search('^//   params', i)])
-    flat = [i.partition('/')[0].replace(',','').replace(')', '').replace('}', '').replace("'", '').replace('"', '').replace('/', '').replace('\\', '').replace(' =~ ', '').replace(' != ', '') for
+    params = [PARAMS_TOKEN_RE.findall(i) for i in contents if
+              PARAMS_RE.search(i) and i != 'params.']
+    params.append([i.replace('//   ','').split(',')[0] for i in contents[start:end] if i.startswith('//   params')])
+    flat = [i.partition('/')[0].translate(PARAM_STRIP_TABLE).replace(' =~ ', '').replace(' != ', '') for
             j in params for i in j]
     # THIS IS TOO RESTRICTIVE!!! This should only be applied if it's not the initial step being called.
     if discard_requires:
@@ -1800,27 +2265,61 @@ def extract_step_slice_from_nfscript(nfscript_path, step):
         step_slice (list): step contents extracted from module.
     """
     step_slice = []
-    contents = []
-    if not(os.path.exists(nfscript_path)):
+    try:
+        nfscript_stat = os.stat(nfscript_path)
+    except FileNotFoundError:
         sys.exit("Module not loaded within project. Exiting.")
-    else:
-        with open(nfscript_path, encoding='utf8') as nf_script_fo:
-            contents = [i.rstrip() for i in nf_script_fo.readlines()]
+    contents, step_bounds = read_nfscript(nfscript_path, nfscript_stat.st_mtime_ns, nfscript_stat.st_size)
     # Need the ability to error out if step doesn't exist. Should list steps
     # from module in that case.
-    if f'workflow {step} {{' in contents:
-        step_start = contents.index(f'workflow {step} {{')
-        step_end = contents.index("}", step_start)
+    if f'workflow {step} {{' in step_bounds:
+        step_start, step_end = step_bounds[f'workflow {step} {{']
         step_slice = contents[step_start:step_end]
-    elif f'process {step} {{' in contents:
-        step_start = contents.index(f'process {step} {{')
-        step_end = contents.index("}", step_start)
+    elif f'process {step} {{' in step_bounds:
+        step_start, step_end = step_bounds[f'process {step} {{']
         step_slice = contents[step_start:step_end]
     else:
         sys.exit(f"Cannot find step {step} in module {nfscript_path}")
     return step_slice
 
 
+@functools.lru_cache(maxsize=None)
+def read_nfscript(nfscript_path, mtime_ns, size):
+    """
+    Part of add-step mode.
+
+    Reads a Nextflow script and locates its step definitions. add-step
+    extracts several steps from the same module files, so results are cached.
+    The modification time and size are part of the cache key so a modified
+    script is re-read. The returned list is shared between callers and must
+    not be modified.
+
+    Args:
+        nfscript_path (str): Path to Nextflow script.
+        mtime_ns (int): Modification time (ns) of nfscript_path.
+        size (int): Size (bytes) of nfscript_path.
+
+    Returns:
+        contents (list): Right-stripped lines of the Nextflow script.
+        step_bounds (dict): Keys are step definition lines (e.g.
+                            'process foo {') and values are (start, end)
+                            indices of the step within contents.
+    """
+    with open(nfscript_path, encoding='utf8') as nf_script_fo:
+        contents = [i.rstrip() for i in nf_script_fo]
+    step_bounds = {}
+    step_starts = []
+    for idx, line in enumerate(contents):
+        if line.startswith(('workflow ', 'process ')) and line.endswith(' {'):
+            step_starts.append((line, idx))
+        elif line == '}':
+            # Steps end at the first closing brace following their definition.
+            for step_def, step_start in step_starts:
+                step_bounds.setdefault(step_def, (step_start, idx))
+            step_starts = []
+    return contents, step_bounds
+
+
 
 def get_workflow_str(wf_slice):
     """
@@ -1886,7 +2385,7 @@ def get_process_params(proc_slice):
     stop_idx = ''
     start_idx = proc_slice.index('// require:')
     stop_idx = proc_slice[start_idx:].index('')
-    params = [x.lstrip('//   ') for x in proc_slice[start_idx+1:start_idx + stop_idx] if re.search('params.', x)]
+    params = [x.lstrip('//   ') for x in proc_slice[start_idx+1:start_idx + stop_idx] if PARAMS_ANY_RE.search(x)]
     cleaned_params = []
     for param in params:
         cleaned_params.append(param)
@@ -1905,14 +2404,36 @@ def push_project(args):
     """
     raft_cfg = load_raft_cfg()
     local_repo = pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'repo')
-    shutil.copyfile(pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'rftpkgs', args.rftpkg + '.rftpkg'),
-                    pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'repo', args.rftpkg + '.rftpkg'))
+    repo_rftpkg = pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'repo', args.rftpkg + '.rftpkg')
+    link_or_copy(pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'rftpkgs', args.rftpkg + '.rftpkg'),
+                 repo_rftpkg)
     repo = Repo(local_repo)
-    repo.index.add(pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'repo', args.rftpkg + '.rftpkg'))
-    repo.index.commit(f"rftpkg commit {time.time()}")
+    # Repo.index reads the index anew on each access, so load it once.
+    index = repo.index
+    index.add(repo_rftpkg)
+    index.commit(f"rftpkg commit {time.time()}")
     repo.git.push('origin', repo.head.ref)
 
 
+def link_or_copy(src, dst):
+    """
+    Hard links src to dst, replacing any existing dst. Falls back to copying
+    when a hard link isn't possible (e.g. across filesystems).
+
+    Args:
+        src (str): Source file path.
+        dst (str): Destination file path.
+    """
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        fast_copy(src, dst)
+
+
 def chk_proj_id_exists(project_id):
     """
     Checks that a user-specific project exists within RAFT's project directory.a
@@ -1943,14 +2464,31 @@ def update_modules(args):
     """
     raft_cfg = load_raft_cfg()
     main_nf = pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'workflow')
-    for module in glob(pjoin(main_nf, '*', '')):
-        if os.path.basename(os.path.dirname(module)) in args.modules.split(',') or not args.modules:
-            repo = Repo(module)
+    modules = set(args.modules.split(','))
+    with os.scandir(main_nf) as wf_it:
+        module_paths = sorted((entry.name, entry.path) for entry in wf_it
+                              if not entry.name.startswith('.') and entry.is_dir()
+                              and (entry.name in modules or not args.modules))
+    pulls = {}
+    failed = []
+    # Pulls are independent and network-bound, so run them concurrently.
+    # args.delay spaces out the start of each pull.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for idx, (module_dir, module_path) in enumerate(module_paths):
+            if idx:
+                time.sleep(args.delay)
+            repo = Repo(module_path)
             ori = repo.remotes.origin
-            module_dir = os.path.basename(os.path.dirname(module))
             print(f"Pulling latest for module {module_dir} (branch {repo.active_branch.name})")
-            ori.pull() # Need some exception handling here.
-            time.sleep(args.delay)
+            pulls[executor.submit(ori.pull)] = module_dir
+        for pull in as_completed(pulls):
+            try:
+                pull.result()
+            except Exception as err:
+                print(f"ERROR: Could not pull latest for module {pulls[pull]}: {err}")
+                failed.append(pulls[pull])
+    if failed:
+        sys.exit(f"ERROR: Could not update module(s) {', '.join(sorted(failed))}.")
 
 
 def rename_project(args):
@@ -1972,13 +2510,12 @@ def rename_project(args):
 
     for renamable_contents_file in renamable_contents:
         # Creating a backup prior to modifying file. Serves as template for renaming.
-        shutil.move(pjoin(proj_dir, renamable_contents_file),
-                    pjoin(proj_dir, renamable_contents_file + '.rename.bak'))
+        os.replace(pjoin(proj_dir, renamable_contents_file),
+                   pjoin(proj_dir, renamable_contents_file + '.rename.bak'))
 
         with open(pjoin(proj_dir, renamable_contents_file), 'w', encoding='utf8') as f_fo:
             with open(pjoin(proj_dir, renamable_contents_file + '.rename.bak'), encoding='utf8') as f_io:
-                for line in f_io.readlines():
-                    f_fo.write(line.replace(args.project_id, args.new_id))
+                f_fo.write(f_io.read().replace(args.project_id, args.new_id))
 
     shutil.move(proj_dir,
                 pjoin(raft_cfg['filesystem']['projects'], args.new_id))
@@ -1992,33 +2529,34 @@ def clean_project(args):
                     args.project_id, 'logs')
     successful_run = ''
     project_uuid = ''
-    with open(pjoin(log_dir, '.nextflow', 'history'), encoding='utf8') as nf_hist_fo:
-        for line in reversed(nf_hist_fo.read().split('\n')):
-            if line:
-                line = line.split('\t')
-                if line[3] == 'OK':
-                    successful_run = line[2]
-                    project_uuid = line[5]
-                    break
+    last_ok_run = get_last_ok_run(pjoin(log_dir, '.nextflow', 'history'))
+    if last_ok_run:
+        successful_run = last_ok_run[2]
+        project_uuid = last_ok_run[5]
     print(f"Project UUID is: {project_uuid}")
     print(f"Last successful run is: {successful_run}")
     os.chdir(pjoin(raft_cfg['filesystem']['projects'], args.project_id, 'logs'))
-    all_work_hashes = [x for x in subprocess.run(f'nextflow log {project_uuid}', shell=True, check=False, capture_output=True).stdout.decode("utf-8").split('\n') if os.path.isdir(x)]
-    successful_work_hashes = [x for x in subprocess.run(f"nextflow log -f 'workdir, status' {successful_run} | grep -E 'COMPLETED|CACHED' | cut -f 1 -d '	'", shell=True, check=False, capture_output=True).stdout.decode("utf-8").split('\n') if x in all_work_hashes]
-    completed_work_hashes = [x for x in subprocess.run(f"nextflow log -f 'workdir, status' {project_uuid} | grep -E 'COMPLETED|CACHED' | cut -f 1 -d '	'", shell=True, check=False, capture_output=True).stdout.decode("utf-8").split('\n') if x in all_work_hashes]
+    # A single log of the project's tasks provides both the full and the
+    # completed work directory lists.
+    project_tasks = get_work_dir_statuses(project_uuid)
+    all_work_hashes = filter_existing_dirs([x for x, status in project_tasks])
+    all_work_hashes_set = set(all_work_hashes)
+    successful_work_hashes = [x for x, status in get_work_dir_statuses(successful_run) if status in ('COMPLETED', 'CACHED') and x in all_work_hashes_set]
+    completed_work_hashes = [x for x, status in project_tasks if status in ('COMPLETED', 'CACHED') and x in all_work_hashes_set]
     print(f"All run work hashes count: {len(all_work_hashes)}")
     print(f"Successful run work hashes count: {len(successful_work_hashes)}")
     print(f"Completed run work hashes count: {len(completed_work_hashes)}")
     cleanable_hashes = []
     if args.keep_latest and input("This will only keep work directories from the latest successful run!\nAre you sure? ") in ['YES', 'yes', 'Yes', 'Y', 'y']:
-        cleanable_hashes = [x for x in all_work_hashes if x not in successful_work_hashes]
+        keepable_hashes = set(successful_work_hashes)
     else:
-        cleanable_hashes = [x for x in all_work_hashes if x not in completed_work_hashes]
+        keepable_hashes = set(completed_work_hashes)
+    cleanable_hashes = [x for x in all_work_hashes if x not in keepable_hashes]
     print(f"Cleanable run work hashes count: {len(cleanable_hashes)}")
     if not args.no_exec:
         for cleanable_dir in cleanable_hashes:
             print(f"Removing extra files from {cleanable_dir}...")
-            cleanable_files = [i for i in os.listdir(cleanable_dir) if i not in ['meta'] and not re.search('command', i)]
+            cleanable_files = [i for i in os.listdir(cleanable_dir) if i not in ['meta'] and 'command' not in i]
             for cleanable_file in cleanable_files:
                 try:
                     shutil.rmtree(cleanable_file)
@@ -2028,6 +2566,24 @@ def clean_project(args):
         print("Skipping deletion due to -n/--no-exec.")
 
 
+def get_work_dir_statuses(run):
+    """
+    Part of clean-project mode.
+
+    Gets the work directory and status of each task within a Nextflow run.
+
+    Args:
+        run (str): Nextflow run name or session identifier.
+
+    Returns:
+        List of (work directory, status) tuples.
+    """
+    # Without a run, nextflow log reports the latest run.
+    nf_log_cmd = ['nextflow', 'log', '-f', 'workdir,status'] + ([run] if run else [])
+    nf_log = subprocess.run(nf_log_cmd, check=False, capture_output=True).stdout.decode("utf-8")
+    return [tuple(line.split('\t')[:2]) for line in nf_log.split('\n') if '\t' in line]
+
+
 def touch(path):
     """
     Touches a path.
@@ -2069,12 +2625,15 @@ def copy_parameters(args):
 
     with open(orig_proj_main, encoding='utf8') as dfo:
         with open(new_proj_main, 'w', encoding='utf8') as tfo:
-            for line in dfo.readlines():
-                parted_line = line.rstrip().partition(' = ')
-                if parted_line[0] in source_params.keys() and source_params[parted_line[0]] != parted_line[2]:
-                    tfo.write(f"{parted_line[0]} = {source_params[parted_line[0]]}\n")
-                else:
-                    tfo.write(line)
+            for line in dfo:
+                # Source parameters all start with 'params.', so only those
+                # rows need parsing.
+                if line.startswith('params.'):
+                    param, _, value = line.rstrip().partition(' = ')
+                    source_value = source_params.get(param)
+                    if source_value is not None and source_value != value:
+                        line = f"{param} = {source_value}\n"
+                tfo.write(line)
     print("Done copying parameters.")
 
 
@@ -2093,11 +2652,11 @@ def extract_params_from_proj_or_cfg(f_obj):
       source_params (dict): Dictionary containing defined parameters from f_obj.
     """
     source_params = {}
-    for line in f_obj.readlines():
+    for line in f_obj:
         line = line.rstrip()
         if (line.startswith('params.') and
 #            not line.partition(' = ')[2].startswith('params') and
-            not re.search('project_identifier', line)):
+            'project_identifier' not in line):
             line = line.partition(' = ')
             source_params[line[0]] = line[2]
     return source_params
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import raft
+
+
+def documented_stub():
+    """
+    Bytecode reference for a test whose body is only a docstring (and pass).
+    """
+
+
+# Tests compiling to either of these bodies are unimplemented stubs.
+STUB_BYTECODES = frozenset([documented_stub.__code__.co_code,
+                            (lambda: None).__code__.co_code])
+
+
+def pytest_collection_modifyitems(items):
+    """
+    Skips stub tests at collection rather than running their empty bodies.
+    """
+    skip_stub = pytest.mark.skip(reason='stub')
+    for item in items:
+        function = getattr(item, 'function', None)
+        if function is not None and function.__code__.co_code in STUB_BYTECODES:
+            item.add_marker(skip_stub)
+
+
+@pytest.fixture(autouse=True)
+def subprocess_calls(monkeypatch):
+    """
+    Keeps tests from launching Nextflow through subprocess.run. Each call
+    succeeds without output and its argv is recorded in the returned list.
+
+    GitPython's clones and inits use subprocess.Popen and are unaffected.
+    """
+    calls = []
+
+    def completed_process(args, *_, **__):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout=b'', stderr=b'')
+
+    monkeypatch.setattr(subprocess, 'run', completed_process)
+    return calls
+
+
+@pytest.fixture
+def raft_tmp(tmp_path, monkeypatch):
+    """
+    Fresh, empty directory used as the current working directory for a test.
+
+    pytest removes old tmp_path directories itself and monkeypatch restores
+    the original working directory even if the test fails.
+    """
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+
+
+def default_setup(raft_dir):
+    """
+    Runs raft.setup with -d/--default in raft_dir.
+
+    Used by fixtures broader than a test, which cannot request the
+    function-scoped monkeypatch fixture themselves.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(raft_dir)
+        raft.setup(argparse.Namespace(default=True))
+    return raft_dir
+
+
+@pytest.fixture(scope='session')
+def raft_setup_template(tmp_path_factory):
+    """
+    RAFT directory set up with -d/--default once per session. Tests may
+    inspect it but must not modify it; use setup_dir for a writable copy.
+    """
+    return default_setup(tmp_path_factory.mktemp('raft_template'))
+
+
+@pytest.fixture
+def setup_dir(raft_setup_template, tmp_path, monkeypatch):
+    """
+    Per-test copy of raft_setup_template used as the current working directory.
+
+    The filesystem paths in .raft.cfg are absolute, so they are pointed at the
+    copy rather than the template.
+    """
+    raft_dir = tmp_path / 'raft'
+    shutil.copytree(raft_setup_template, raft_dir, symlinks=True)
+    cfg_path = raft_dir / '.raft.cfg'
+    with open(cfg_path, encoding='utf8') as cfg_fo:
+        cfg = json.load(cfg_fo)
+    cfg['filesystem'] = {name: path.replace(str(raft_setup_template), str(raft_dir), 1)
+                         for name, path in cfg['filesystem'].items()}
+    raft.dump_cfg(str(cfg_path), cfg)
+    monkeypatch.chdir(raft_dir)
+    yield raft_dir
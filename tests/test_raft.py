@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 
 import pytest
-from hashlib import md5
-from glob import glob
+from dataclasses import dataclass
+import hashlib
 import os
 import shutil
 from pathlib import Path
@@ -10,48 +10,56 @@ import json
 import sys
 import re
 
-from os.path import join as pjoin
-
 import raft
 
+@dataclass
 class Args:
-    pass
-
-BASE_DIR = os.path.join(os.getcwd(), 't')
-SCRIPTS_DIR = os.getcwd()
-
-def setup_defaults(self, test_name):
     """
+    Stand-in for the argparse Namespace each RAFT mode receives.
     """
-    args = Args()
-    args.default = True
-    tmp_dir = pjoin(BASE_DIR, test_name)
-    shutil.rmtree(tmp_dir, ignore_errors=True)
-    os.makedirs(tmp_dir)
-    os.chdir(tmp_dir)
-    raft.setup(args)
-
-
-def teardown_instance(self, test_name):
+    default: bool = False
+    init_config: str = ''
+    project_id: str = ''
+    repo_url: str = ''
+    file: str = ''
+    sub_dir: str = ''
+    mode: str = ''
+    repo: str = ''
+    module: str = ''
+    branches: str = ''
+    no_deps: bool = False
+    delay: int = 0
+    alias: str = ''
+    subworkflow: str = ''
+    step: str = ''
+    nf_params: str = ''
+    workflow: str = 'main'
+    no_resume: bool = False
+    keep_previous_outputs: bool = False
+    no_reports: bool = False
+    keep_latest: bool = False
+    no_exec: bool = False
+
+
+@pytest.fixture
+def args():
     """
+    Args for running setup mode with -d/--default.
     """
-    tmp_dir = pjoin(BASE_DIR, test_name)
-    shutil.rmtree(tmp_dir, ignore_errors=True)
+    return Args(default=True)
+
+# md5 of the .raft.cfg written by raft.setup with -d/--default.
+EXPECTED_CFG_DIGEST = bytes.fromhex('193c0ef03f2cc8eaf86f98a4f94ce3b2')
+
+# Test inputs live next to this file, wherever pytest is launched from.
+DATA_DIR = Path(__file__).parent / 'data'
 
 class TestSetup:
-    def test_setup_defaults(self):
+    def test_setup_defaults(self, raft_tmp, args):
         """
         Test setup mode with -d/--default option.
         """
-        args = Args()
-        args.default = True
-        tmp_dir = pjoin(BASE_DIR, 'test_setup_defaults')
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
         raft.setup(args)
-        os.chdir('..')
-        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 #def test_setup_user_defined_dirs(self):
 #    """
@@ -59,130 +67,65 @@ class TestSetup:
 #    """
 #    pass
 
-    def test_setup_cfg_creation(self):
+    def test_setup_cfg_creation(self, raft_setup_template):
         """
         """
-        args = Args()
-        args.default = True
-        tmp_dir = pjoin(BASE_DIR, 'test_setup_cfg_creation')
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        raft.setup(args)
-        os.chdir('..')
-        capd_raft_cfg = glob(os.path.join(tmp_dir, '.raft.cfg'))[0]
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-        assert capd_raft_cfg
+        assert (raft_setup_template / '.raft.cfg').is_file()
 
 
-    def test_setup_cfg_backup_and_creation(self):
+    def test_setup_cfg_backup_and_creation(self, setup_dir, args):
         """
         """
-        args = Args()
-        args.default = True
-        tmp_dir = pjoin(BASE_DIR, 'test_setup_cfg_creation')
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        raft.setup(args)
         raft.setup(args)
-        os.chdir('..')
-        capd_raft_cfg = glob(os.path.join(tmp_dir, '.raft.cfg'))[0]
-        capd_raft_cfg_orig = glob(os.path.join(tmp_dir, '.raft.cfg.orig'))[0]
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-        assert capd_raft_cfg
-        assert capd_raft_cfg_orig
-
-    def test_setup_chk_cfg_contents(self):
-        """
-        """
-        args = Args()
-        args.default = True
-        tmp_dir = pjoin(BASE_DIR, 'test_setup_cfg_creation')
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        raft.setup(args)
-        os.chdir('..')
-        capd_raft_cfg = glob(os.path.join(tmp_dir, '.raft.cfg'))[0]
-        cfg_md5 = md5()
-        with open(capd_raft_cfg, 'rb') as fo:
-                cfg_md5.update(fo.read())
-        cfg_md5 = cfg_md5.hexdigest()
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-        assert cfg_md5 == '193c0ef03f2cc8eaf86f98a4f94ce3b2'
+        assert (setup_dir / '.raft.cfg').is_file()
+        assert (setup_dir / '.raft.cfg.orig').is_file()
+
+    def test_setup_chk_cfg_contents(self, raft_setup_template):
+        """
+        """
+        with open(raft_setup_template / '.raft.cfg', 'rb') as fo:
+            if hasattr(hashlib, 'file_digest'):
+                cfg_digest = hashlib.file_digest(fo, 'md5').digest()
+            else:
+                cfg_digest = hashlib.md5(fo.read()).digest()
+        assert cfg_digest == EXPECTED_CFG_DIGEST
 
 class TestInitProject:
 
-    def test_init_project_default(self):
+    def test_init_project_default(self, setup_dir):
         """
         """
         test_name = 'test_init_project_init_cfg'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        os.chdir('..')
-        dirs = [os.path.basename(x) for x in glob(os.path.join(tmp_dir, 'projects', test_name, '*'))]
+        # Hidden entries (e.g. .raft) are not part of the checked layout.
+        dirs = {x for x in os.listdir(setup_dir / 'projects' / test_name) if not x.startswith('.')}
         print(sorted(dirs))
-        teardown_instance(self, test_name)
-        assert sorted(dirs) == ['fastqs', 'indicies', 'logs', 'metadata', 'outputs', 'references', 'rftpkgs', 'tmp', 'work', 'workflow']
+        assert dirs == {'fastqs', 'indicies', 'logs', 'metadata', 'outputs', 'references', 'rftpkgs', 'tmp', 'work', 'workflow'}
 
-    def test_init_project_duplicate_project_id(self):
+    def test_init_project_duplicate_project_id(self, setup_dir):
         """
         """
+        test_name = 'test_init_project_duplicate_project_id'
+        #Initial
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        raft.init_project(args)
+        #Duplicate
         with pytest.raises(SystemExit):
-                test_name = 'test_init_project_duplicate_project_id'
-                tmp_dir = pjoin(BASE_DIR, test_name)
-                os.makedirs(tmp_dir)
-                os.chdir(tmp_dir)
-                setup_defaults(self, test_name)
-                #Initial
-                args = Args()
-                args.init_config = pjoin(tmp_dir, '.init.cfg')
-                args.project_id = test_name
-                args.repo_url = ''
-                raft.init_project(args)
-                #Duplicate
-                raft.init_project(args)
-                os.chdir('..')
-        teardown_instance(self, test_name)
-
-    def test_init_project_nameless_project_id(self):
+            raft.init_project(args)
+
+    def test_init_project_nameless_project_id(self, setup_dir):
         """
         """
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id='', repo_url='')
         with pytest.raises(SystemExit):
-                test_name = 'test_init_project_nameless_project_id'
-                tmp_dir = pjoin(BASE_DIR, test_name)
-                os.makedirs(tmp_dir)
-                os.chdir(tmp_dir)
-                setup_defaults(self, test_name)
-                #Initial
-                args = Args()
-                args.init_config = pjoin(tmp_dir, '.init.cfg')
-                args.project_id = ''
-                args.repo_url = ''
-                raft.init_project(args)
-                os.chdir('..')
-        teardown_instance(self, test_name)
-
-    def test_init_project_alt_init_cfg(self):
+            raft.init_project(args)
+
+    def test_init_project_alt_init_cfg(self, setup_dir):
         """
         """
         test_name = 'test_init_project_alt_init_cfg'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(project_id=test_name, repo_url='')
         # Changing to alternate .init.cfg here...
 
         init_cfg = {"this_dir_indicates_an_alt_cfg": "",
@@ -198,57 +141,48 @@ class TestInitProject:
                     "rftpkgs": "",
                     ".raft": ""}
 
-        with open(pjoin(tmp_dir, '.init.alt.cfg'), 'w', encoding='utf8') as init_cfg_fo:
+        with open(setup_dir / '.init.alt.cfg', 'w', encoding='utf8') as init_cfg_fo:
             json.dump(init_cfg, init_cfg_fo)
 
-        args.init_config = pjoin(tmp_dir, '.init.alt.cfg')
+        args.init_config = str(setup_dir / '.init.alt.cfg')
         raft.init_project(args)
-        os.chdir('..')
-        dirs = [os.path.basename(x) for x in glob(os.path.join(tmp_dir, 'projects', test_name, '*'))]
+        # Hidden entries (e.g. .raft) are not part of the checked layout.
+        dirs = {x for x in os.listdir(setup_dir / 'projects' / test_name) if not x.startswith('.')}
         print(sorted(dirs))
-        teardown_instance(self, test_name)
-        assert sorted(dirs) == ['fastqs', 'indicies', 'logs', 'metadata', 'outputs', 'references', 'rftpkgs', 'this_dir_indicates_an_alt_cfg', 'tmp', 'work', 'workflow']
+        assert dirs == {'fastqs', 'indicies', 'logs', 'metadata', 'outputs', 'references', 'rftpkgs', 'this_dir_indicates_an_alt_cfg', 'tmp', 'work', 'workflow'}
 
-    def test_init_project_malformed_init_cfg(self):
+    def test_init_project_malformed_init_cfg(self, setup_dir):
         """
         """
+        test_name = 'test_init_project_malformed_init_cfg'
+        args = Args(project_id=test_name, repo_url='')
+        # Changing to alternate .init.cfg here...
+
+        init_cfg = {"this_is_a_malformed_cfg":"",
+                    "indicies": "",
+                    "references": "",
+                    "fastqs": "",
+                    "tmp": "",
+                    "outputs": "",
+                    "workflow": "",
+                    "work": "",
+                    "metadata": "",
+                    "logs": "",
+                    "rftpkgs": "",
+                    ".raft": ""}
+
+        with open(setup_dir / '.init.t.cfg', 'w', encoding='utf8') as init_cfg_fo:
+            json.dump(init_cfg, init_cfg_fo)
+
+        with open(setup_dir / '.init.t.cfg', encoding='utf8') as t_cfg_fo:
+            with open(setup_dir / '.init.malf.cfg', 'w', encoding='utf8') as malf_cfg_fo:
+                for line in t_cfg_fo.readlines():
+                    line = line.partition(':')[:2]
+                    malf_cfg_fo.write("{}\n".format(line))
+
+        args.init_config = str(setup_dir / '.init.malf.cfg')
         with pytest.raises(json.decoder.JSONDecodeError):
-            test_name = 'test_init_project_malformed_init_cfg'
-            tmp_dir = pjoin(BASE_DIR, test_name)
-            args = Args()
-            args.init_config = pjoin(tmp_dir, '.init.cfg')
-            args.project_id = test_name
-            args.repo_url = ''
-            os.makedirs(tmp_dir)
-            os.chdir(tmp_dir)
-            setup_defaults(self, test_name)
-            # Changing to alternate .init.cfg here...
-
-            init_cfg = {"this_is_a_malformed_cfg":"",
-                        "indicies": "",
-                        "references": "",
-                        "fastqs": "",
-                        "tmp": "",
-                        "outputs": "",
-                        "workflow": "",
-                        "work": "",
-                        "metadata": "",
-                        "logs": "",
-                        "rftpkgs": "",
-                        ".raft": ""}
-
-            with open(pjoin(tmp_dir, '.init.t.cfg'), 'w', encoding='utf8') as init_cfg_fo:
-                json.dump(init_cfg, init_cfg_fo)
-
-            with open(pjoin(tmp_dir, '.init.t.cfg'), encoding='utf8') as t_cfg_fo:
-                with open(pjoin(tmp_dir, '.init.malf.cfg'), 'w', encoding='utf8') as malf_cfg_fo:
-                    for line in t_cfg_fo.readlines():
-                        line = line.partition(':')[:2]
-                        malf_cfg_fo.write("{}\n".format(line))
-
-            args.init_config = pjoin(tmp_dir, '.init.malf.cfg')
             raft.init_project(args)
-        teardown_instance(self, test_name)
 
     def test_init_project_repo_url(self):
         """
@@ -261,176 +195,92 @@ class TestInitProject:
         pass
 
 class TestLoadReference:
-    def test_load_reference_standard(self):
+    def test_load_reference_standard(self, setup_dir):
         """
         """
         test_name = 'test_load_reference_standard'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
-        shutil.copyfile(pjoin(SCRIPTS_DIR, 'data', 'references', 'test.fa'), pjoin(BASE_DIR, test_name, 'references', 'test.fa'))
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        shutil.copyfile(DATA_DIR / 'references' / 'test.fa', setup_dir / 'references' / 'test.fa')
         raft.init_project(args)
-        args = Args()
-        args.file = 'test.fa'
-        args.sub_dir = ''
-        args.project_id = test_name
-        args.mode = 'symlink'
+        args = Args(file='test.fa', sub_dir='', project_id=test_name, mode='symlink')
         raft.load_reference(args)
-        assert glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'references', 'test.fa'))[0]
-        teardown_instance(self, test_name)
+        assert (setup_dir / 'projects' / test_name / 'references' / 'test.fa').exists()
 
-    def test_load_reference_load_duplicate_ref(self):
+    def test_load_reference_load_duplicate_ref(self, setup_dir):
         """
         """
+        test_name = 'test_load_reference_load_duplicate_ref'
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        shutil.copyfile(DATA_DIR / 'references' / 'test.fa', setup_dir / 'references' / 'test.fa')
+        raft.init_project(args)
+        args = Args(file='test.fa', sub_dir='', project_id=test_name, mode='symlink')
+        # Initial loading
+        raft.load_reference(args)
+        # Loading again
         with pytest.raises(SystemExit):
-            test_name = 'test_load_reference_load_duplicate_ref'
-            tmp_dir = pjoin(BASE_DIR, test_name)
-            args = Args()
-            args.init_config = pjoin(tmp_dir, '.init.cfg')
-            args.project_id = test_name
-            args.repo_url = ''
-            os.makedirs(tmp_dir)
-            os.chdir(tmp_dir)
-            setup_defaults(self, test_name)
-            shutil.copyfile(pjoin(SCRIPTS_DIR, 'data', 'references', 'test.fa'), pjoin(BASE_DIR, test_name, 'references', 'test.fa'))
-            raft.init_project(args)
-            args = Args()
-            args.file = 'test.fa'
-            args.sub_dir = ''
-            args.project_id = test_name
-            args.mode = 'symlink'
-            # Initial loading
-            raft.load_reference(args)
-            # Loading again
             raft.load_reference(args)
-        teardown_instance(self, test_name)
 
-    def test_load_reference_load_nonspecific_ref(self):
+    def test_load_reference_load_nonspecific_ref(self, setup_dir):
+        test_name = 'test_load_reference_load_nonspecific_ref'
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        os.mkdir(setup_dir / 'references' / 'dup1')
+        os.mkdir(setup_dir / 'references' / 'dup2')
+        shutil.copyfile(DATA_DIR / 'references' / 'test.fa', setup_dir / 'references' / 'dup1' / 'test.fa')
+        shutil.copyfile(DATA_DIR / 'references' / 'test.fa', setup_dir / 'references' / 'dup2' / 'test.fa')
+        raft.init_project(args)
+        args = Args(file='test.fa', sub_dir='', project_id=test_name, mode='symlink')
         with pytest.raises(SystemExit):
-            test_name = 'test_load_reference_load_nonspecific_ref'
-            tmp_dir = pjoin(BASE_DIR, test_name)
-            args = Args()
-            args.init_config = pjoin(tmp_dir, '.init.cfg')
-            args.project_id = test_name
-            args.repo_url = ''
-            os.makedirs(tmp_dir)
-            os.chdir(tmp_dir)
-            setup_defaults(self, test_name)
-            os.mkdir(pjoin(BASE_DIR, test_name, 'references', 'dup1'))
-            os.mkdir(pjoin(BASE_DIR, test_name, 'references', 'dup2'))
-            shutil.copyfile(pjoin(SCRIPTS_DIR, 'data', 'references', 'test.fa'), pjoin(BASE_DIR, test_name, 'references', 'dup1', 'test.fa'))
-            shutil.copyfile(pjoin(SCRIPTS_DIR, 'data', 'references', 'test.fa'), pjoin(BASE_DIR, test_name, 'references', 'dup2', 'test.fa'))
-            raft.init_project(args)
-            args = Args()
-            args.file = 'test.fa'
-            args.sub_dir = ''
-            args.project_id = test_name
-            args.mode = 'symlink'
             raft.load_reference(args)
-        teardown_instance(self, test_name)
 
-    def test_load_reference_load_missing_ref(self):
+    def test_load_reference_load_missing_ref(self, setup_dir):
         """
         """
+        test_name = 'test_load_reference_load_missing_ref'
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        shutil.copyfile(DATA_DIR / 'references' / 'test.fa', setup_dir / 'references' / 'test.fa')
+        raft.init_project(args)
+        args = Args(file='test2.fa', sub_dir='', project_id=test_name, mode='symlink')
         with pytest.raises(SystemExit):
-            test_name = 'test_load_reference_load_missing_ref'
-            tmp_dir = pjoin(BASE_DIR, test_name)
-            args = Args()
-            args.init_config = pjoin(tmp_dir, '.init.cfg')
-            args.project_id = test_name
-            args.repo_url = ''
-            os.makedirs(tmp_dir)
-            os.chdir(tmp_dir)
-            setup_defaults(self, test_name)
-            shutil.copyfile(pjoin(SCRIPTS_DIR, 'data', 'references', 'test.fa'), pjoin(BASE_DIR, test_name, 'references', 'test.fa'))
-            raft.init_project(args)
-            args = Args()
-            args.file = 'test2.fa'
-            args.sub_dir = ''
-            args.project_id = test_name
-            args.mode = 'symlink'
             raft.load_reference(args)
-        teardown_instance(self, test_name)
 
-    def test_load_reference_load_to_subdir(self):
+    def test_load_reference_load_to_subdir(self, setup_dir):
         """
         """
         pass
         test_name = 'test_load_reference_to_subdir'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
-        shutil.copyfile(pjoin(SCRIPTS_DIR, 'data', 'references', 'test.fa'), pjoin(BASE_DIR, test_name, 'references', 'test.fa'))
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        shutil.copyfile(DATA_DIR / 'references' / 'test.fa', setup_dir / 'references' / 'test.fa')
         raft.init_project(args)
-        args = Args()
-        args.file = 'test.fa'
-        args.sub_dir = 'subdir_test'
-        args.project_id = test_name
-        args.mode = 'symlink'
+        args = Args(file='test.fa', sub_dir='subdir_test', project_id=test_name, mode='symlink')
         raft.load_reference(args)
-        assert glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'references', 'subdir_test', 'test.fa'))[0]
-        teardown_instance(self, test_name)
+        assert (setup_dir / 'projects' / test_name / 'references' / 'subdir_test' / 'test.fa').exists()
 
     def test_load_reference_load_to_mult_subdirs(self):
         """
         """
         pass
 
-    def test_load_reference_load_symlink(self):
+    def test_load_reference_load_symlink(self, setup_dir):
         """
         """
         test_name = 'test_load_reference_standard'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
-        os.symlink(pjoin(SCRIPTS_DIR, 'data', 'references', 'test.fa'), pjoin(BASE_DIR, test_name, 'references', 'test.fa'))
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        os.symlink(DATA_DIR / 'references' / 'test.fa', setup_dir / 'references' / 'test.fa')
         raft.init_project(args)
-        args = Args()
-        args.file = 'test.fa'
-        args.sub_dir = ''
-        args.project_id = test_name
-        args.mode = 'symlink'
+        args = Args(file='test.fa', sub_dir='', project_id=test_name, mode='symlink')
         raft.load_reference(args)
-        assert glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'references', 'test.fa'))[0]
-        teardown_instance(self, test_name)
+        assert (setup_dir / 'projects' / test_name / 'references' / 'test.fa').exists()
 
-    def test_load_reference_load_w_invalid_project_id(self):
+    def test_load_reference_load_w_invalid_project_id(self, setup_dir):
         """
         """
+        test_name = 'test_load_reference_w_invalid_project_id'
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        shutil.copyfile(DATA_DIR / 'references' / 'test.fa', setup_dir / 'references' / 'test.fa')
+        raft.init_project(args)
+        args = Args(file='test.fa', sub_dir='', project_id='this_project_doesnt_exist', mode='symlink')
         with pytest.raises(SystemExit):
-            test_name = 'test_load_reference_w_invalid_project_id'
-            tmp_dir = pjoin(BASE_DIR, test_name)
-            args = Args()
-            args.init_config = pjoin(tmp_dir, '.init.cfg')
-            args.project_id = test_name
-            args.repo_url = ''
-            os.makedirs(tmp_dir)
-            os.chdir(tmp_dir)
-            setup_defaults(self, test_name)
-            shutil.copyfile(pjoin(SCRIPTS_DIR, 'data', 'references', 'test.fa'), pjoin(BASE_DIR, test_name, 'references', 'test.fa'))
-            raft.init_project(args)
-            args = Args()
-            args.file = 'test.fa'
-            args.sub_dir = ''
-            args.project_id = 'this_project_doesnt_exist'
-            args.mode = 'symlink'
             raft.load_reference(args)
-        teardown_instance(self, test_name)
 
     def test_load_reference_chk_mounts_config(self):
         """
@@ -438,6 +288,27 @@ class TestLoadReference:
         pass
 
 
+class TestUpdateMounts:
+    def test_update_mounts_cfg_minimal_dirs(self, tmp_path):
+        """
+        Directories already covered by a bound directory should be dropped.
+        """
+        mounts_cfg = tmp_path / 'mounts.config'
+        mounts_cfg.write_text('/raft/projects/proj,/raft,/data/fastqs/a\n')
+        raft.update_mounts_cfg(str(mounts_cfg), ['/data/fastqs', '/raft/references', '/data1', '/data-b'])
+        assert set(mounts_cfg.read_text().strip().split(',')) == {'/raft', '/data/fastqs', '/data1', '/data-b'}
+
+    def test_update_mounts_cfg_adjacent_subdirs(self, tmp_path):
+        """
+        Consecutive subdirectories of a newly bound directory should all be
+        dropped (none skipped).
+        """
+        mounts_cfg = tmp_path / 'mounts.config'
+        mounts_cfg.write_text('/data/a,/data/b,/data/c,/other\n')
+        raft.update_mounts_cfg(str(mounts_cfg), ['/data'])
+        assert set(mounts_cfg.read_text().strip().split(',')) == {'/data', '/other'}
+
+
 class TestLoadMetadata:
     def test_load_metadata_standard(self):
         """
@@ -485,58 +356,30 @@ class TestLoadMetadata:
         pass
 
 class TestLoadModule:
-    def test_load_module_standard(self):
+    def test_load_module_standard(self, setup_dir):
         """
         """
         test_name = 'test_load_module_standard'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'salmon'
-        args.branches = 'main'
-        args.no_deps = False
-        args.delay = 15
+        args = Args(project_id=test_name, repo='', module='salmon', branches='main', no_deps=False, delay=15)
         raft.load_module(args)
-        assert glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'salmon'))[0]
-        teardown_instance(self, test_name)
+        assert (setup_dir / 'projects' / test_name / 'workflow' / 'salmon').exists()
 
     def test_load_module_invalid_project_id(self):
         """
         """
         pass
 
-    def test_load_module_chk_submodules(self):
+    def test_load_module_chk_submodules(self, setup_dir):
         """
         """
         test_name = 'test_load_module_chk_submodules'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'rna_quant'
-        args.branches = 'main'
-        args.no_deps = False
-        args.delay = 15
+        args = Args(project_id=test_name, repo='', module='rna_quant', branches='main', no_deps=False, delay=15)
         raft.load_module(args)
-        assert glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'salmon'))[0]
-        teardown_instance(self, test_name)
+        assert (setup_dir / 'projects' / test_name / 'workflow' / 'salmon').exists()
 
     def test_module_alt_repo(self):
         """
@@ -558,266 +401,115 @@ class TestLoadModule:
         """
         pass
 
-    def test_load_module_multi_load_dependency(self):
+    def test_load_module_multi_load_dependency(self, setup_dir):
         """
         If a module has already been loaded, then RAFT should skip it.
         """
         test_name = 'test_load_module_multi_primary_load'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'salmon'
-        args.branches = 'main'
-        args.no_deps = False
-        args.delay = 15
+        args = Args(project_id=test_name, repo='', module='salmon', branches='main', no_deps=False, delay=15)
         raft.load_module(args)
         raft.load_module(args)
-        assert glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'salmon'))[0]
-        teardown_instance(self, test_name)
+        assert (setup_dir / 'projects' / test_name / 'workflow' / 'salmon').exists()
 
-    def test_load_module_no_deps(self):
+    def test_load_module_no_deps(self, setup_dir):
         """
         """
         test_name = 'test_load_module_no_deps'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'rna_quant'
-        args.branches = 'main'
-        args.no_deps = True
-        args.delay = 15
+        args = Args(project_id=test_name, repo='', module='rna_quant', branches='main', no_deps=True, delay=15)
         raft.load_module(args)
-        assert len(glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'salmon'))) == 0
-        teardown_instance(self, test_name)
+        assert not (setup_dir / 'projects' / test_name / 'workflow' / 'salmon').exists()
 
-    def test_load_module_multi_modules(self):
+    def test_load_module_multi_modules(self, setup_dir):
         """
         """
         test_name = 'test_load_module_multi_modules'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'salmon'
-        args.branches = 'main'
-        args.no_deps = False
-        args.delay = 15
+        args = Args(project_id=test_name, repo='', module='salmon', branches='main', no_deps=False, delay=15)
         raft.load_module(args)
         args.module = 'star'
         raft.load_module(args)
-        assert glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'salmon'))[0]
-        assert glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'star'))[0]
-        teardown_instance(self, test_name)
+        assert (setup_dir / 'projects' / test_name / 'workflow' / 'salmon').exists()
+        assert (setup_dir / 'projects' / test_name / 'workflow' / 'star').exists()
 
-    def test_load_module_alt_delay(self):
+    def test_load_module_alt_delay(self, setup_dir):
         """
         """
         test_name = 'test_load_module_multi_modules'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'salmon'
-        args.branches = 'main'
-        args.no_deps = False
-        args.delay = 30
+        args = Args(project_id=test_name, repo='', module='salmon', branches='main', no_deps=False, delay=30)
         raft.load_module(args)
-        assert glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'salmon'))[0]
-        teardown_instance(self, test_name)
+        assert (setup_dir / 'projects' / test_name / 'workflow' / 'salmon').exists()
 
 class TestAddStep:
-    def test_add_step_valid_step(self):
+    def test_add_step_valid_step(self, setup_dir):
         """
         """
         test_name = 'test_add_step_valid_step'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'rna_quant'
-        args.branches = 'main'
-        args.no_deps = False
-        args.delay = 15
+        args = Args(project_id=test_name, repo='', module='rna_quant', branches='main', no_deps=False, delay=15)
         raft.load_module(args)
-        args = Args()
-        args.alias = ''
-        args.subworkflow = 'main'
-        args.project_id = test_name
-        args.module = 'rna_quant'
-        args.step = 'manifest_to_star_alns_salmon_counts'
+        args = Args(alias='', subworkflow='main', project_id=test_name, module='rna_quant', step='manifest_to_star_alns_salmon_counts')
         raft.add_step(args)
-        with open(glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'main.nf'))[0]) as fo:
+        with open(setup_dir / 'projects' / test_name / 'workflow' / 'main.nf') as fo:
             assert any([re.search('manifest_to_star_alns_salmon_counts', x) for x in fo.readlines()])
-        teardown_instance(self, test_name)
 
-    def test_add_step_invalid_step(self):
+    def test_add_step_invalid_step(self, setup_dir):
         """
         """
+        test_name = 'test_add_step_invalid_step'
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        raft.init_project(args)
         with pytest.raises(SystemExit):
-            test_name = 'test_add_step_invalid_step'
-            tmp_dir = pjoin(BASE_DIR, test_name)
-            args = Args()
-            args.init_config = pjoin(tmp_dir, '.init.cfg')
-            args.project_id = test_name
-            args.repo_url = ''
-            os.makedirs(tmp_dir)
-            os.chdir(tmp_dir)
-            setup_defaults(self, test_name)
-            raft.init_project(args)
-            args = Args()
-            args.project_id = test_name
-            args.repo = ''
-            args.module = 'salmon'
-            args.branches = 'main'
-            args.no_deps = False
-            args.delay = 15
+            args = Args(project_id=test_name, repo='', module='salmon', branches='main', no_deps=False, delay=15)
             raft.load_module(args)
-            args = Args()
-            args.alias = ''
-            args.subworkflow = 'main'
-            args.project_id = test_name
-            args.module = 'salmon'
-            args.step = 'this_is_a_fake_step'
+            args = Args(alias='', subworkflow='main', project_id=test_name, module='salmon', step='this_is_a_fake_step')
             raft.add_step(args)
-        teardown_instance(self, test_name)
 
-    def test_add_step_valid_multiple_times(self):
+    def test_add_step_valid_multiple_times(self, setup_dir):
         """
         """
+        test_name = 'test_add_valid_multiple_times'
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
+        raft.init_project(args)
         with pytest.raises(SystemExit):
-            test_name = 'test_add_valid_multiple_times'
-            tmp_dir = pjoin(BASE_DIR, test_name)
-            args = Args()
-            args.init_config = pjoin(tmp_dir, '.init.cfg')
-            args.project_id = test_name
-            args.repo_url = ''
-            os.makedirs(tmp_dir)
-            os.chdir(tmp_dir)
-            setup_defaults(self, test_name)
-            raft.init_project(args)
-            args = Args()
-            args.project_id = test_name
-            args.repo = ''
-            args.module = 'rna_quant'
-            args.branches = 'main'
-            args.no_deps = False
-            args.delay = 15
+            args = Args(project_id=test_name, repo='', module='rna_quant', branches='main', no_deps=False, delay=15)
             raft.load_module(args)
-            args = Args()
-            args.alias = ''
-            args.subworkflow = 'main'
-            args.project_id = test_name
-            args.module = 'rna_quant'
-            args.step = 'manifest_to_star_alns_salmon_counts'
+            args = Args(alias='', subworkflow='main', project_id=test_name, module='rna_quant', step='manifest_to_star_alns_salmon_counts')
             raft.add_step(args)
             raft.add_step(args)
-        teardown_instance(self, test_name)
 
-    def test_add_step_check_mainnf_inclusion(self):
+    def test_add_step_check_mainnf_inclusion(self, setup_dir):
         """
         """
         test_name = 'test_add_step_valid_step'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'rna_quant'
-        args.branches = 'main'
-        args.no_deps = False
-        args.delay = 15
+        args = Args(project_id=test_name, repo='', module='rna_quant', branches='main', no_deps=False, delay=15)
         raft.load_module(args)
-        args = Args()
-        args.alias = ''
-        args.subworkflow = 'main'
-        args.project_id = test_name
-        args.module = 'rna_quant'
-        args.step = 'manifest_to_star_alns_salmon_counts'
+        args = Args(alias='', subworkflow='main', project_id=test_name, module='rna_quant', step='manifest_to_star_alns_salmon_counts')
         raft.add_step(args)
-        with open(glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'main.nf'))[0]) as fo:
+        with open(setup_dir / 'projects' / test_name / 'workflow' / 'main.nf') as fo:
             assert any([re.search("include { manifest_to_star_alns_salmon_counts } from './rna_quant/rna_quant.nf'", x) for x in fo.readlines()])
-        teardown_instance(self, test_name)
 
-    def test_add_step_check_mainnf_workflow(self):
+    def test_add_step_check_mainnf_workflow(self, setup_dir):
         """
         """
         test_name = 'test_add_step_valid_step'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'rna_quant'
-        args.branches = 'main'
-        args.no_deps = False
-        args.delay = 15
+        args = Args(project_id=test_name, repo='', module='rna_quant', branches='main', no_deps=False, delay=15)
         raft.load_module(args)
-        args = Args()
-        args.alias = ''
-        args.subworkflow = 'main'
-        args.project_id = test_name
-        args.module = 'rna_quant'
-        args.step = 'manifest_to_star_alns_salmon_counts'
+        args = Args(alias='', subworkflow='main', project_id=test_name, module='rna_quant', step='manifest_to_star_alns_salmon_counts')
         raft.add_step(args)
-        with open(glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'main.nf'))[0]) as fo:
+        with open(setup_dir / 'projects' / test_name / 'workflow' / 'main.nf') as fo:
             assert any([re.search('manifest_to_star_alns_salmon_counts', x) for x in fo.readlines()])
-        teardown_instance(self, test_name)
 
 
     def test_add_step_check_primary_parameters(self):
@@ -838,59 +530,75 @@ class TestAddStep:
         """
         pass
 
-    def test_add_step_using_alias(self):
+    def test_add_step_using_alias(self, setup_dir):
         test_name = 'test_add_step_using_alias'
-        tmp_dir = pjoin(BASE_DIR, test_name)
-        args = Args()
-        args.init_config = pjoin(tmp_dir, '.init.cfg')
-        args.project_id = test_name
-        args.repo_url = ''
-        os.makedirs(tmp_dir)
-        os.chdir(tmp_dir)
-        setup_defaults(self, test_name)
+        args = Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name, repo_url='')
         raft.init_project(args)
-        args = Args()
-        args.project_id = test_name
-        args.repo = ''
-        args.module = 'rna_quant'
-        args.branches = 'main'
-        args.no_deps = False
-        args.delay = 15
+        args = Args(project_id=test_name, repo='', module='rna_quant', branches='main', no_deps=False, delay=15)
         raft.load_module(args)
-        args = Args()
-        args.alias = 'manifest_to_star_alns_salmon_counts_alt'
-        args.subworkflow = 'main'
-        args.project_id = test_name
-        args.module = 'rna_quant'
-        args.step = 'manifest_to_star_alns_salmon_counts'
+        args = Args(alias='manifest_to_star_alns_salmon_counts_alt', subworkflow='main', project_id=test_name, module='rna_quant', step='manifest_to_star_alns_salmon_counts')
         raft.add_step(args)
-        with open(glob(pjoin(BASE_DIR, test_name, 'projects', test_name, 'workflow', 'main.nf'))[0]) as fo:
+        with open(setup_dir / 'projects' / test_name / 'workflow' / 'main.nf') as fo:
             assert any([re.search('manifest_to_star_alns_salmon_counts_alt', x) for x in fo.readlines()])
-        teardown_instance(self, test_name)
 
     def test_add_step_using_taken_alias(self):
         """
         """
         pass
 
+def init_run_project(setup_dir, test_name):
+    """
+    Initializes project test_name within setup_dir.
+
+    Returns:
+        Path to the project directory.
+    """
+    raft.init_project(Args(init_config=str(setup_dir / '.init.cfg'), project_id=test_name))
+    return setup_dir / 'projects' / test_name
+
+
 class TestRunWorkflow:
 
-    def test_run_workflow_stock(self):
+    def test_run_workflow_stock(self, setup_dir, subprocess_calls):
         """
         """
-        pass
+        test_name = 'test_run_workflow_stock'
+        proj_dir = init_run_project(setup_dir, test_name)
+        raft.run_workflow(Args(project_id=test_name))
+        assert subprocess_calls == [['nextflow', '-Dnxf.pool.type=sync', 'run', str(proj_dir / 'workflow' / 'main.nf'),
+                                     '--project_dir', str(proj_dir), '-resume',
+                                     '-with-trace', '-with-report', '-with-dag', '-with-timeline',
+                                     '-w', str(proj_dir / 'work'),
+                                     '--global_fq_dir', str(setup_dir / 'fastqs'),
+                                     '--shared_dir', str(setup_dir / 'shared')]]
+
+    def test_run_workflow_fast_parse(self, tmp_path, monkeypatch):
+        """
+        Fast run-workflow argument parsing should agree with argparse.
+        """
+        # get_args() uses the working directory for its -i/--init-config default.
+        monkeypatch.chdir(tmp_path)
+        argv = ['raft.py', 'run-workflow', '-p', 'proj', '-n=-profile test', '--no-resume', '-k']
+        monkeypatch.setenv('RAFT_DEBUG_ARGPARSE', '1')
+        monkeypatch.setattr(sys, 'argv', argv)
+        assert raft.fast_parse_run_workflow(argv[2:]) == raft.get_args()
+        assert raft.fast_parse_run_workflow(['-p', 'proj', '--unknown']) is None
+        assert raft.fast_parse_run_workflow(['-p', 'proj', '-n', '-profile test']) is None
 
     def test_run_workflow_invalid_project(self):
         """
         """
         pass
 
-    def test_run_workflow_no_resume(self):
+    def test_run_workflow_no_resume(self, setup_dir, subprocess_calls):
         """
         """
-        pass
+        test_name = 'test_run_workflow_no_resume'
+        init_run_project(setup_dir, test_name)
+        raft.run_workflow(Args(project_id=test_name, no_resume=True))
+        assert '-resume' not in subprocess_calls[0]
 
-    def test_run_workflow_no_resume(self):
+    def test_run_workflow_resume(self):
         """
         """
         pass
@@ -900,12 +608,20 @@ class TestRunWorkflow:
         """
         pass
 
-    def test_run_workflow_pass_nf_params(self):
+    def test_run_workflow_pass_nf_params(self, setup_dir, subprocess_calls, monkeypatch):
         """
+        nf-params are split like a shell command line, with $VARs and ~
+        expanded.
         """
-        pass
+        test_name = 'test_run_workflow_pass_nf_params'
+        proj_dir = init_run_project(setup_dir, test_name)
+        monkeypatch.setenv('RAFT_TEST_VAR', 'value')
+        monkeypatch.setenv('HOME', '/home/raft')
+        raft.run_workflow(Args(project_id=test_name, nf_params="-profile test --a '$RAFT_TEST_VAR b' --c ~/d"))
+        main_nf_idx = subprocess_calls[0].index(str(proj_dir / 'workflow' / 'main.nf'))
+        assert subprocess_calls[0][main_nf_idx + 1:main_nf_idx + 7] == ['-profile', 'test', '--a', 'value b', '--c', '/home/raft/d']
 
-    def test_run_workflow_pass_nf_params(self):
+    def test_run_workflow_nf_params_override(self):
         """
         """
         pass
@@ -935,7 +651,56 @@ class TestListSteps:
         """
         pass
 
-#class TestPackageProject:
+class TestPackageProject:
+    def test_md5(self, tmp_path):
+        """
+        """
+        fle = tmp_path / 'test.fa'
+        shutil.copyfile(DATA_DIR / 'references' / 'test.fa', fle)
+        with open(fle, 'rb') as fo:
+            assert raft.md5(str(fle)) == hashlib.md5(fo.read()).hexdigest()
+
+    def test_fast_copy_short_copy_file_range(self, tmp_path, monkeypatch):
+        """
+        A copy_file_range that reports 0 bytes copied must not leave an empty
+        or truncated copy.
+        """
+        src = tmp_path / 'test.fa'
+        dst = tmp_path / 'copy.fa'
+        shutil.copyfile(DATA_DIR / 'references' / 'test.fa', src)
+        monkeypatch.setattr(os, 'copy_file_range', lambda *args: 0, raising=False)
+        raft.fast_copy(str(src), str(dst))
+        assert dst.read_bytes() == src.read_bytes()
+
+
+class TestCleanProject:
+    def test_clean_project_nf_log_cmds(self, setup_dir, subprocess_calls):
+        """
+        Work directories are looked up for the project's session and its last
+        successful run.
+        """
+        test_name = 'test_clean_project_nf_log_cmds'
+        proj_dir = init_run_project(setup_dir, test_name)
+        (proj_dir / 'logs' / '.nextflow').mkdir()
+        (proj_dir / 'logs' / '.nextflow' / 'history').write_text(
+            '2022-01-01 00:00:00\t1m\tgood_run\tOK\tabc123\tsession-uuid\tnextflow run main.nf\n'
+            '2022-01-02 00:00:00\t1m\tbad_run\tERR\tabc123\tsession-uuid\tnextflow run main.nf\n')
+        raft.clean_project(Args(project_id=test_name))
+        assert subprocess_calls == [['nextflow', 'log', '-f', 'workdir,status', 'session-uuid'],
+                                    ['nextflow', 'log', '-f', 'workdir,status', 'good_run']]
+
+    def test_clean_project_no_successful_run(self, setup_dir, subprocess_calls):
+        """
+        Without a successful run, no empty run argument is passed to nextflow log.
+        """
+        test_name = 'test_clean_project_no_successful_run'
+        proj_dir = init_run_project(setup_dir, test_name)
+        (proj_dir / 'logs' / '.nextflow').mkdir()
+        (proj_dir / 'logs' / '.nextflow' / 'history').write_text('')
+        raft.clean_project(Args(project_id=test_name))
+        assert subprocess_calls == [['nextflow', 'log', '-f', 'workdir,status']] * 2
+
+
 #class TestLoadProject:
 
 